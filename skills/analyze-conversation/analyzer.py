@@ -3,30 +3,77 @@
 Comprehensive conversation analysis for extracting anti-patterns, tooling gaps, and insights.
 """
 
-import json
+import re
 import sys
-from collections import defaultdict, Counter
+from heapq import nlargest
+from operator import itemgetter
+
+try:
+    import orjson as json  # ~5x faster JSON parsing when available
+except ImportError:
+    import json
 from typing import List, Dict, Any
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
+
+# Compiled once at import; detect_hardcoded_values runs per assistant message.
+# Single alternation with named groups so one linear scan reports every
+# pattern class (add future secret/key patterns as new groups here).
+_HARDCODED_RE = re.compile(
+    # Zero-width match at the start of a password-assignment line, so IPs
+    # embedded in the same line are still reported by this pass.
+    r'(?P<password>^(?=[^\n]*password)(?=[^\n]*=))'
+    r'|(?P<ip_address>\b\d{1,3}(?:\.\d{1,3}){3}\b)',
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# Error markers in tool results; caseless scan avoids lowering the whole result
+_ERR_RE = re.compile(r'error|failed', re.IGNORECASE)
+
+# Interned tool names allow identity comparison in the dispatch chain
+_BASH = sys.intern('Bash')
+_READ = sys.intern('Read')
+_EDIT = sys.intern('Edit')
+_WRITE = sys.intern('Write')
+_GREP = sys.intern('Grep')
+
+
+@dataclass(slots=True)
+class BashCmd:
+    """A single Bash tool invocation."""
+    command: str
+    description: str
+    timestamp: str
+
+
+@dataclass(slots=True)
+class ErrorRec:
+    """A tool result that looked like an error."""
+    tool_use_id: str
+    content: str
+    timestamp: str
+
 
 @dataclass
 class ConversationStats:
     """Statistics extracted from conversation."""
     total_turns: int = 0
-    user_messages: List[str] = field(default_factory=list)
-    assistant_messages: List[str] = field(default_factory=list)
-    bash_commands: List[Dict[str, Any]] = field(default_factory=list)
-    file_reads: List[str] = field(default_factory=list)
-    file_writes: List[str] = field(default_factory=list)
-    file_edits: List[Dict[str, Any]] = field(default_factory=list)
+    # Only the counts are ever reported for these; storing the payloads
+    # would cost O(messages) memory for nothing
+    user_message_count: int = 0
+    assistant_message_count: int = 0
+    file_read_count: int = 0
+    file_write_count: int = 0
+    file_edit_count: int = 0
+    bash_commands: List[BashCmd] = field(default_factory=list)
     grep_searches: List[str] = field(default_factory=list)
-    errors: List[Dict[str, Any]] = field(default_factory=list)
+    errors: List[ErrorRec] = field(default_factory=list)
     retries: List[Dict[str, Any]] = field(default_factory=list)
-    scope_expansions: List[str] = field(default_factory=list)
+    # Dict keys for ordered dedup; duplicate sentences collapse on insert
+    scope_expansions: Dict[str, None] = field(default_factory=dict)
     hardcoded_values: List[Dict[str, Any]] = field(default_factory=list)
 
-    # Command patterns
-    repeated_commands: Counter = field(default_factory=Counter)
+    # Command patterns (command -> count; plain dict beats Counter on hot increments)
+    repeated_commands: Dict[str, int] = field(default_factory=dict)
     failed_commands: List[Dict[str, Any]] = field(default_factory=list)
 
     # Decision points
@@ -34,31 +81,49 @@ class ConversationStats:
     questions_asked: List[str] = field(default_factory=list)
 
 
-def load_conversation(filepath: str) -> List[Dict]:
-    """Load JSONL conversation file."""
-    messages = []
-    with open(filepath, 'r') as f:
+def iter_conversation(filepath: str):
+    """Yield parsed messages from a JSONL conversation file one at a time.
+
+    Keeps peak memory at one message regardless of transcript size.
+    """
+    # 1 MiB buffer: far fewer read syscalls than the 8 KiB default on
+    # multi-MB transcripts, at no meaningful memory cost
+    with open(filepath, 'rb', buffering=1 << 20) as f:
         for line in f:
             if line.strip():
-                messages.append(json.loads(line))
-    return messages
+                yield json.loads(line)
+
+
+def load_conversation(filepath: str) -> List[Dict]:
+    """Load JSONL conversation file."""
+    return list(iter_conversation(filepath))
 
 
 def extract_text_from_content(content: Any) -> str:
     """Extract text from message content (handles various formats)."""
-    if isinstance(content, str):
+    # Hot path: content is usually already a str; exact type checks are
+    # cheaper than isinstance here.
+    t = type(content)
+    if t is str:
         return content
-    if isinstance(content, list):
-        texts = []
+    if t is list:
+        # Preallocate for the common all-text case and track how many slots
+        # were actually written.
+        texts = [None] * len(content)
+        n = 0
         for item in content:
             if isinstance(item, dict):
-                if item.get('type') == 'text':
-                    texts.append(item.get('text', ''))
-                elif item.get('type') == 'thinking':
-                    texts.append(f"[THINKING: {item.get('thinking', '')[:200]}...]")
+                item_type = item.get('type')
+                if item_type == 'text':
+                    texts[n] = item.get('text', '')
+                    n += 1
+                elif item_type == 'thinking':
+                    texts[n] = f"[THINKING: {item.get('thinking', '')[:200]}...]"
+                    n += 1
             elif isinstance(item, str):
-                texts.append(item)
-        return '\n'.join(texts)
+                texts[n] = item
+                n += 1
+        return '\n'.join(texts[:n])
     return str(content)
 
 
@@ -68,38 +133,40 @@ def analyze_tool_use(message: Dict, stats: ConversationStats):
     if not isinstance(content, list):
         return
 
+    ts = message.get('timestamp', '')
+
     for item in content:
         if not isinstance(item, dict):
             continue
 
         tool_name = item.get('name')
-        tool_input = item.get('input', {})
-
-        if tool_name == 'Bash':
-            cmd = tool_input.get('command', '')
-            desc = tool_input.get('description', '')
-            stats.bash_commands.append({
-                'command': cmd,
-                'description': desc,
-                'timestamp': message.get('timestamp', '')
-            })
-            stats.repeated_commands[cmd] += 1
+        if tool_name is None:
+            continue
+        tool_name = sys.intern(tool_name)
+        ti = item.get('input') or {}
 
-        elif tool_name == 'Read':
-            stats.file_reads.append(tool_input.get('file_path', ''))
+        # Branches ordered by expected tool frequency: Bash, Read, Edit
+        if tool_name is _BASH:
+            cmd = ti.get('command') or ''
+            stats.bash_commands.append(BashCmd(
+                command=cmd,
+                description=ti.get('description') or '',
+                timestamp=ts
+            ))
+            rc = stats.repeated_commands
+            rc[cmd] = rc.get(cmd, 0) + 1
 
-        elif tool_name == 'Write':
-            stats.file_writes.append(tool_input.get('file_path', ''))
+        elif tool_name is _READ:
+            stats.file_read_count += 1
 
-        elif tool_name == 'Edit':
-            stats.file_edits.append({
-                'file': tool_input.get('file_path', ''),
-                'old': tool_input.get('old_string', '')[:100],
-                'new': tool_input.get('new_string', '')[:100]
-            })
+        elif tool_name is _EDIT:
+            stats.file_edit_count += 1
+
+        elif tool_name is _WRITE:
+            stats.file_write_count += 1
 
-        elif tool_name == 'Grep':
-            stats.grep_searches.append(tool_input.get('pattern', ''))
+        elif tool_name is _GREP:
+            stats.grep_searches.append(ti.get('pattern') or '')
 
 
 def analyze_tool_results(message: Dict, stats: ConversationStats):
@@ -108,43 +175,50 @@ def analyze_tool_results(message: Dict, stats: ConversationStats):
     if not isinstance(content, list):
         return
 
+    ts = message.get('timestamp', '')
+
     for item in content:
         if not isinstance(item, dict):
             continue
 
         if item.get('type') == 'tool_result':
             result_content = item.get('content', '')
-            result_str = str(result_content)
+            # Avoid str() on structured content: repr of a big list/dict
+            # allocates MBs with no extra signal for the error scan.
+            if isinstance(result_content, str):
+                result_str = result_content
+            elif isinstance(result_content, list):
+                result_str = extract_text_from_content(result_content)
+            else:
+                continue
 
             # Check for errors
-            if 'error' in result_str.lower() or 'failed' in result_str.lower():
-                stats.errors.append({
-                    'tool_use_id': item.get('tool_use_id', ''),
-                    'content': result_str[:500],
-                    'timestamp': message.get('timestamp', '')
-                })
+            if _ERR_RE.search(result_str):
+                stats.errors.append(ErrorRec(
+                    tool_use_id=item.get('tool_use_id', ''),
+                    content=result_str[:500],
+                    timestamp=ts
+                ))
 
 
 def detect_hardcoded_values(text: str) -> List[Dict[str, str]]:
     """Detect potential hardcoded values (passwords, IPs, secrets)."""
     patterns = []
-
-    # Look for password assignments
-    if 'password' in text.lower() and '=' in text:
-        for line in text.split('\n'):
-            if 'password' in line.lower() and '=' in line:
-                patterns.append({
-                    'type': 'password',
-                    'line': line.strip()[:200]
-                })
-
-    # Look for IP addresses being set
-    import re
-    ip_pattern = r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b'
-    if re.search(ip_pattern, text):
-        for match in re.finditer(ip_pattern, text):
-            context = text[max(0, match.start()-50):min(len(text), match.end()+50)]
-            patterns.append({
+    append = patterns.append
+
+    for match in _HARDCODED_RE.finditer(text):
+        s, e = match.span()
+        if match.lastgroup == 'password':
+            eol = text.find('\n', s)
+            line = text[s:eol if eol != -1 else len(text)]
+            append({
+                'type': 'password',
+                'line': line.strip()[:200]
+            })
+        else:
+            # Slice semantics clamp the end; only the start needs a guard
+            context = text[s - 50 if s >= 50 else 0:e + 50]
+            append({
                 'type': 'ip_address',
                 'value': match.group(),
                 'context': context
@@ -153,144 +227,270 @@ def detect_hardcoded_values(text: str) -> List[Dict[str, str]]:
     return patterns
 
 
-def detect_scope_expansion(user_msg: str, assistant_msgs: List[str]) -> List[str]:
-    """Detect when assistant expanded scope beyond original request."""
+EXPANSION_KEYWORDS = ['also', 'additionally', 'furthermore', 'we should also',
+                      'let me also', 'i will also', 'we need to']
+
+# One alternation so every keyword is found in a single scan per message
+_EXPANSION_RE = re.compile('|'.join(re.escape(k) for k in EXPANSION_KEYWORDS))
+
+
+def detect_scope_expansion(user_msg: str, assistant_msgs: List[str],
+                           assistant_msgs_lower: List[str]) -> List[str]:
+    """Detect when assistant expanded scope beyond original request.
+
+    Callers pass pre-lowered message copies so each message is lowercased
+    exactly once per conversation.
+    """
     expansions = []
 
     # Simple heuristic: if assistant mentions creating/building things not in user request
-    original_words = set(user_msg.lower().split())
+    for msg, msg_lower in zip(assistant_msgs, assistant_msgs_lower):
+        for match in _EXPANSION_RE.finditer(msg_lower):
+            # Extract sentence containing keyword via sentence-boundary scan
+            start = msg.rfind('.', 0, match.start()) + 1
+            end = msg.find('.', match.end())
+            if end == -1:
+                end = len(msg)
+            expansions.append(msg[start:end].strip())
 
-    expansion_keywords = ['also', 'additionally', 'furthermore', 'we should also',
-                          'let me also', 'i will also', 'we need to']
+    return expansions
 
-    for msg in assistant_msgs:
-        msg_lower = msg.lower()
-        for keyword in expansion_keywords:
-            if keyword in msg_lower:
-                # Extract sentence containing keyword
-                sentences = msg.split('.')
-                for sent in sentences:
-                    if keyword in sent.lower():
-                        expansions.append(sent.strip())
 
-    return expansions
+def _handle_user(msg: Dict, stats: ConversationStats, ctx: Dict[str, Any]):
+    """Process a user message: close out the previous turn and start a new one."""
+    # Analyze previous turn if exists
+    if ctx['user_msg'] and ctx['assistant_msgs']:
+        expansions = detect_scope_expansion(ctx['user_msg'], ctx['assistant_msgs'],
+                                            ctx['assistant_msgs_lower'])
+        stats.scope_expansions.update(dict.fromkeys(expansions))
+
+    # Start new turn
+    content = msg.get('message', {}).get('content', '')
+    ctx['user_msg'] = extract_text_from_content(content)
+    stats.user_message_count += 1
+    ctx['assistant_msgs'] = []
+    ctx['assistant_msgs_lower'] = []
+    stats.total_turns += 1
+
+
+def _handle_assistant(msg: Dict, stats: ConversationStats, ctx: Dict[str, Any]):
+    """Process an assistant message: text, tool use/results, hardcoded values."""
+    content = msg.get('message', {}).get('content', '')
+    text = extract_text_from_content(content)
+    ctx['assistant_msgs'].append(text)
+    ctx['assistant_msgs_lower'].append(text.lower())
+    stats.assistant_message_count += 1
+
+    # Analyze tool use
+    analyze_tool_use(msg, stats)
+    analyze_tool_results(msg, stats)
+
+    # Check for hardcoded values
+    hardcoded = detect_hardcoded_values(text)
+    stats.hardcoded_values.extend(hardcoded)
+
+
+_HANDLERS = {
+    'user': _handle_user,
+    'assistant': _handle_assistant,
+}
+
+
+def analyze_messages(messages) -> ConversationStats:
+    """Analyze an iterable of already-parsed messages.
+
+    Accepts a generator or a list, so callers that hold messages in
+    memory for other detectors can reuse the same parse.
+    """
+    stats = ConversationStats()
+
+    # Turn state threaded through the per-type handlers
+    ctx: Dict[str, Any] = {'user_msg': '', 'assistant_msgs': [], 'assistant_msgs_lower': []}
+
+    for msg in messages:
+        handler = _HANDLERS.get(msg.get('type'))
+        if handler:
+            handler(msg, stats, ctx)
+
+    return stats
 
 
 def analyze_conversation(filepath: str) -> ConversationStats:
     """Main analysis function."""
-    messages = load_conversation(filepath)
+    return analyze_messages(iter_conversation(filepath))
+
+
+def _analyze_lines(lines: List[bytes]) -> ConversationStats:
+    """Worker: analyze one turn-aligned chunk of raw JSONL lines."""
     stats = ConversationStats()
+    ctx: Dict[str, Any] = {'user_msg': '', 'assistant_msgs': [], 'assistant_msgs_lower': []}
 
-    current_user_msg = ""
-    current_assistant_msgs = []
+    for line in lines:
+        msg = json.loads(line)
+        handler = _HANDLERS.get(msg.get('type'))
+        if handler:
+            handler(msg, stats, ctx)
 
-    for msg in messages:
-        msg_type = msg.get('type')
-
-        if msg_type == 'user':
-            # Analyze previous turn if exists
-            if current_user_msg and current_assistant_msgs:
-                expansions = detect_scope_expansion(current_user_msg, current_assistant_msgs)
-                stats.scope_expansions.extend(expansions)
-
-            # Start new turn
-            content = msg.get('message', {}).get('content', '')
-            current_user_msg = extract_text_from_content(content)
-            stats.user_messages.append(current_user_msg)
-            current_assistant_msgs = []
-            stats.total_turns += 1
-
-        elif msg_type == 'assistant':
-            content = msg.get('message', {}).get('content', '')
-            text = extract_text_from_content(content)
-            current_assistant_msgs.append(text)
-            stats.assistant_messages.append(text)
-
-            # Analyze tool use
-            analyze_tool_use(msg, stats)
-            analyze_tool_results(msg, stats)
-
-            # Check for hardcoded values
-            hardcoded = detect_hardcoded_values(text)
-            stats.hardcoded_values.extend(hardcoded)
+    # Close out the chunk's final turn so nothing is lost at chunk boundaries
+    if ctx['user_msg'] and ctx['assistant_msgs']:
+        stats.scope_expansions.update(dict.fromkeys(
+            detect_scope_expansion(ctx['user_msg'], ctx['assistant_msgs'],
+                                   ctx['assistant_msgs_lower'])))
 
     return stats
 
 
+def _merge_stats(shards: List[ConversationStats]) -> ConversationStats:
+    """Merge per-chunk ConversationStats shards in order."""
+    merged = ConversationStats()
+    for shard in shards:
+        for f in fields(ConversationStats):
+            ours = getattr(merged, f.name)
+            theirs = getattr(shard, f.name)
+            if isinstance(ours, list):
+                ours.extend(theirs)
+            elif isinstance(ours, dict):
+                if f.name == 'repeated_commands':
+                    for key, count in theirs.items():
+                        ours[key] = ours.get(key, 0) + count
+                else:
+                    ours.update(theirs)
+            else:
+                setattr(merged, f.name, ours + theirs)
+    return merged
+
+
+def analyze_conversation_parallel(filepath: str, workers: int = None) -> ConversationStats:
+    """Analyze a large transcript across a multiprocessing pool.
+
+    The file is split into chunks aligned on user-message (turn)
+    boundaries so scope-expansion pairing stays within one worker; the
+    per-chunk stats are merged in order at the end. Falls back to the
+    sequential path for small files.
+    """
+    import multiprocessing
+
+    workers = workers or multiprocessing.cpu_count()
+
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    lines = [line for line in data.splitlines() if line]
+
+    if workers <= 1 or len(lines) < workers * 4:
+        return analyze_conversation(filepath)
+
+    # Advance each boundary to the next user message so no turn spans two
+    # workers; only the handful of probed boundary lines are parsed here.
+    step = len(lines) // workers
+    bounds = [0]
+    for k in range(1, workers):
+        i = k * step
+        while i < len(lines) and json.loads(lines[i]).get('type') != 'user':
+            i += 1
+        if bounds[-1] < i < len(lines):
+            bounds.append(i)
+    bounds.append(len(lines))
+
+    chunks = [lines[a:b] for a, b in zip(bounds, bounds[1:]) if a < b]
+    with multiprocessing.Pool(len(chunks)) as pool:
+        shards = pool.map(_analyze_lines, chunks)
+
+    return _merge_stats(shards)
+
+
 def print_anti_patterns(stats: ConversationStats):
     """Print identified anti-patterns."""
-    print("=" * 80)
-    print("ANTI-PATTERN ANALYSIS")
-    print("=" * 80)
-
-    print("\n1. REPEATED COMMANDS (potential tool opportunities)")
-    print("-" * 80)
-    for cmd, count in stats.repeated_commands.most_common(20):
+    out = []
+    out.append("=" * 80)
+    out.append("ANTI-PATTERN ANALYSIS")
+    out.append("=" * 80)
+
+    out.append("\n1. REPEATED COMMANDS (potential tool opportunities)")
+    out.append("-" * 80)
+    # O(N log 20) selection instead of sorting the whole command table
+    for cmd, count in nlargest(20, stats.repeated_commands.items(), key=itemgetter(1)):
         if count >= 3:
-            print(f"  [{count}x] {cmd[:100]}")
+            out.append(f"  [{count}x] {cmd[:100]}")
 
-    print("\n2. HARDCODED VALUES DETECTED")
-    print("-" * 80)
+    out.append("\n2. HARDCODED VALUES DETECTED")
+    out.append("-" * 80)
     for item in stats.hardcoded_values[:20]:
-        print(f"  Type: {item['type']}")
-        print(f"  Context: {item.get('line', item.get('context', ''))[:150]}")
-        print()
+        out.append(f"  Type: {item['type']}")
+        out.append(f"  Context: {item.get('line', item.get('context', ''))[:150]}")
+        out.append("")
 
-    print("\n3. SCOPE EXPANSIONS")
-    print("-" * 80)
-    for expansion in stats.scope_expansions[:15]:
-        print(f"  • {expansion[:200]}")
+    out.append("\n3. SCOPE EXPANSIONS")
+    out.append("-" * 80)
+    for expansion in list(stats.scope_expansions)[:15]:
+        out.append(f"  • {expansion[:200]}")
 
-    print("\n4. ERRORS ENCOUNTERED")
-    print("-" * 80)
+    out.append("\n4. ERRORS ENCOUNTERED")
+    out.append("-" * 80)
     for error in stats.errors[:20]:
-        print(f"  Timestamp: {error.get('timestamp', 'N/A')}")
-        print(f"  Content: {error['content'][:300]}")
-        print()
+        out.append(f"  Timestamp: {error.timestamp or 'N/A'}")
+        out.append(f"  Content: {error.content[:300]}")
+        out.append("")
+
+    sys.stdout.write('\n'.join(out))
+    sys.stdout.write('\n')
 
 
 def print_tooling_analysis(stats: ConversationStats):
     """Print tooling gaps and opportunities."""
-    print("\n" + "=" * 80)
-    print("TOOLING ANALYSIS")
-    print("=" * 80)
-
-    print("\n1. FILE OPERATIONS")
-    print("-" * 80)
-    print(f"  Files Read: {len(stats.file_reads)}")
-    print(f"  Files Written: {len(stats.file_writes)}")
-    print(f"  Files Edited: {len(stats.file_edits)}")
-
-    print("\n2. COMMAND PATTERNS")
-    print("-" * 80)
-
-    # Group similar commands
-    kubectl_cmds = [c for c in stats.bash_commands if 'kubectl' in c['command']]
-    docker_cmds = [c for c in stats.bash_commands if 'docker' in c['command']]
-    pytest_cmds = [c for c in stats.bash_commands if 'pytest' in c['command']]
-
-    print(f"  kubectl commands: {len(kubectl_cmds)}")
-    print(f"  docker commands: {len(docker_cmds)}")
-    print(f"  pytest commands: {len(pytest_cmds)}")
-
-    print("\n3. GREP SEARCHES (exploration patterns)")
-    print("-" * 80)
+    out = []
+    out.append("\n" + "=" * 80)
+    out.append("TOOLING ANALYSIS")
+    out.append("=" * 80)
+
+    out.append("\n1. FILE OPERATIONS")
+    out.append("-" * 80)
+    out.append(f"  Files Read: {stats.file_read_count}")
+    out.append(f"  Files Written: {stats.file_write_count}")
+    out.append(f"  Files Edited: {stats.file_edit_count}")
+
+    out.append("\n2. COMMAND PATTERNS")
+    out.append("-" * 80)
+
+    # Count command groups in a single pass
+    kubectl_count = docker_count = pytest_count = 0
+    for c in stats.bash_commands:
+        cmd = c.command
+        if 'kubectl' in cmd:
+            kubectl_count += 1
+        if 'docker' in cmd:
+            docker_count += 1
+        if 'pytest' in cmd:
+            pytest_count += 1
+
+    out.append(f"  kubectl commands: {kubectl_count}")
+    out.append(f"  docker commands: {docker_count}")
+    out.append(f"  pytest commands: {pytest_count}")
+
+    out.append("\n3. GREP SEARCHES (exploration patterns)")
+    out.append("-" * 80)
     for pattern in stats.grep_searches[:15]:
-        print(f"  • {pattern}")
+        out.append(f"  • {pattern}")
+
+    sys.stdout.write('\n'.join(out))
+    sys.stdout.write('\n')
 
 
 def print_summary(stats: ConversationStats):
     """Print overall summary."""
-    print("\n" + "=" * 80)
-    print("CONVERSATION SUMMARY")
-    print("=" * 80)
-    print(f"  Total turns: {stats.total_turns}")
-    print(f"  User messages: {len(stats.user_messages)}")
-    print(f"  Assistant messages: {len(stats.assistant_messages)}")
-    print(f"  Bash commands: {len(stats.bash_commands)}")
-    print(f"  Errors encountered: {len(stats.errors)}")
-    print(f"  Scope expansions detected: {len(stats.scope_expansions)}")
-    print(f"  Hardcoded values found: {len(stats.hardcoded_values)}")
+    out = []
+    out.append("\n" + "=" * 80)
+    out.append("CONVERSATION SUMMARY")
+    out.append("=" * 80)
+    out.append(f"  Total turns: {stats.total_turns}")
+    out.append(f"  User messages: {stats.user_message_count}")
+    out.append(f"  Assistant messages: {stats.assistant_message_count}")
+    out.append(f"  Bash commands: {len(stats.bash_commands)}")
+    out.append(f"  Errors encountered: {len(stats.errors)}")
+    out.append(f"  Scope expansions detected: {len(stats.scope_expansions)}")
+    out.append(f"  Hardcoded values found: {len(stats.hardcoded_values)}")
+
+    sys.stdout.write('\n'.join(out))
+    sys.stdout.write('\n')
 
 
 if __name__ == '__main__':
@@ -4,35 +4,36 @@ Generates comprehensive retrospective report from conversation analysis.
 Entry point for /analyze-conversation skill.
 """
 
+import bisect
+import functools
+import hashlib
+import pickle
 import sys
 import os
 from datetime import datetime
+from heapq import nlargest
+from operator import itemgetter
 from pathlib import Path
 
-# Import from analyzer and patterns modules
+# Make the sibling analyzer and patterns modules importable; the imports
+# themselves happen lazily in generate_markdown_report so fast-fail paths
+# (e.g. a bad --id lookup) skip their load cost
 sys.path.insert(0, os.path.dirname(__file__))
-from analyzer import analyze_conversation
-from patterns import (
-    find_credential_antipatterns,
-    find_retry_without_diagnosis,
-    find_scope_creep,
-    find_missing_verification,
-    find_tool_opportunities,
-    extract_conversation_timeline,
-    load_messages
-)
+
+
+# Resolved once at import; Path.home() re-derives $HOME on every call
+_HOME = Path.home()
+_PROJECTS_DIR = _HOME / '.claude' / 'projects'
+_DEFAULT_RETRO_DIR = _HOME / '.claude' / 'retrospectives'
 
 
 def find_conversation_file(conversation_id=None):
     """Find conversation JSONL file."""
     if conversation_id:
-        # Search in .claude/projects/
-        projects_dir = Path.home() / '.claude' / 'projects'
-        for project_dir in projects_dir.iterdir():
-            if project_dir.is_dir():
-                conv_file = project_dir / f'{conversation_id}.jsonl'
-                if conv_file.exists():
-                    return str(conv_file)
+        # Search in .claude/projects/ with a single glob; the literal
+        # filename component needs no extra stat per project directory
+        for conv_file in _PROJECTS_DIR.glob(f'*/{conversation_id}.jsonl'):
+            return str(conv_file)
         raise FileNotFoundError(f"Conversation {conversation_id} not found")
     else:
         # Use current conversation (most recent JSONL in current project)
@@ -65,21 +66,57 @@ NORMAL_TEST_COMMANDS = {
 }
 
 
-def is_normal_dev_command(cmd: str) -> bool:
-    """Check if command is a normal development pattern."""
-    cmd_lower = cmd.lower().strip()
+# Sorted prefixes let a single bisect find the only candidate that can
+# prefix-match a given command (no entry is a prefix of another entry)
+_ALL_PREFIXES = tuple(sorted(NORMAL_DEV_COMMANDS | NORMAL_TEST_COMMANDS))
 
-    # Check exact matches
-    for normal_cmd in NORMAL_DEV_COMMANDS:
-        if cmd_lower.startswith(normal_cmd):
-            return True
 
-    # Check test commands
-    for test_cmd in NORMAL_TEST_COMMANDS:
-        if cmd_lower.startswith(test_cmd):
-            return True
+def is_normal_dev_command_lower(cmd_lower: str) -> bool:
+    """Prefix check for callers that already lowered/stripped the command."""
+    i = bisect.bisect_right(_ALL_PREFIXES, cmd_lower) - 1
+    return i >= 0 and cmd_lower.startswith(_ALL_PREFIXES[i])
+
+
+def is_normal_dev_command(cmd: str) -> bool:
+    """Check if command is a normal development pattern."""
+    return is_normal_dev_command_lower(cmd.lower().strip())
+
+
+@functools.lru_cache(maxsize=128)
+def _probe_project_dirs(project_dir_name: str) -> tuple:
+    """Stat the project tree for docs/CLI markers; pure in the slug, so cached.
+
+    Returns (has_project_cli, has_tools_doc, has_claude_md, has_operations_md).
+    """
+    # Convert back to path: <project-slug> -> ~/Documents/myproject
+    project_path = Path('/' + project_dir_name[1:].replace('-', '/'))
+
+    # One readdir covers all three top-level doc checks
+    try:
+        names = {entry.name for entry in os.scandir(project_path)}
+    except OSError:
+        names = set()
+
+    has_claude_md = 'CLAUDE.md' in names
+    has_operations_md = 'OPERATIONS.md' in names
+    has_tools_doc = 'TOOLS.md' in names
+
+    # Check for project CLI
+    has_project_cli = False
+    for subdir in ['myproject_cp', '.']:
+        if (project_path / subdir / 'scripts').exists():
+            has_project_cli = True
+            break
+
+    # Check for bin/myproject or similar; home paths only probed when
+    # the project-local path misses
+    if not has_project_cli:
+        for pattern in ['bin/myproject', 'scripts/myproject', '.local/bin/myproject']:
+            if (project_path / pattern).exists() or (_HOME / pattern).exists():
+                has_project_cli = True
+                break
 
-    return False
+    return has_project_cli, has_tools_doc, has_claude_md, has_operations_md
 
 
 def check_project_context(conversation_file: str) -> dict:
@@ -95,355 +132,400 @@ def check_project_context(conversation_file: str) -> dict:
     # Try to find project root from conversation file path
     # e.g., ~/.claude/projects/<project-slug>/...
     # maps to ~/Documents/myproject/
-    conv_path = Path(conversation_file)
-    project_dir_name = conv_path.parent.name  # e.g., <project-slug>
+    project_dir_name = Path(conversation_file).parent.name  # e.g., <project-slug>
 
     if project_dir_name.startswith('-'):
-        # Convert back to path: <project-slug> -> ~/Documents/myproject
-        project_path = Path('/' + project_dir_name[1:].replace('-', '/'))
-
-        # Check for common documentation files
-        if (project_path / 'CLAUDE.md').exists():
-            context['has_claude_md'] = True
-        if (project_path / 'OPERATIONS.md').exists():
-            context['has_operations_md'] = True
-        if (project_path / 'TOOLS.md').exists():
-            context['has_tools_doc'] = True
-
-        # Check for project CLI
-        for subdir in ['myproject_cp', '.']:
-            scripts_dir = project_path / subdir / 'scripts'
-            if scripts_dir.exists():
-                context['has_project_cli'] = True
-                break
-
-        # Check for bin/myproject or similar
-        for pattern in ['bin/myproject', 'scripts/myproject', '.local/bin/myproject']:
-            if (project_path / pattern).exists() or (Path.home() / pattern).exists():
-                context['has_project_cli'] = True
-                break
+        (context['has_project_cli'], context['has_tools_doc'],
+         context['has_claude_md'], context['has_operations_md']) = \
+            _probe_project_dirs(project_dir_name)
 
     return context
 
 
+def _opp_row(cmd: str) -> tuple:
+    """Compute the display snippet and suggested tool name for a command once."""
+    parts = cmd.split()
+    head = parts[0] if parts else 'cmd'
+    return cmd[:80], f"myproject-{head}"
+
+
 def generate_markdown_report(conversation_file: str, output_dir: str = None) -> str:
     """Generate comprehensive markdown report."""
+    from analyzer import analyze_messages
+    from patterns import (
+        find_credential_antipatterns,
+        find_retry_without_diagnosis,
+        find_scope_creep,
+        find_missing_verification,
+        find_tool_opportunities,
+        extract_conversation_timeline,
+        load_messages,
+        precompute_texts
+    )
 
     # Create output directory
     if output_dir is None:
-        output_dir = Path.home() / '.claude' / 'retrospectives'
+        output_dir = _DEFAULT_RETRO_DIR
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # Extract conversation ID from filename
     conv_id = Path(conversation_file).stem
 
-    # Run analysis
-    print(f"Analyzing conversation: {conv_id}...")
-    stats = analyze_conversation(conversation_file)
-    messages = load_messages(conversation_file)
-
-    # Check project context for existing tools/docs
-    project_context = check_project_context(conversation_file)
-
-    # Extract detailed patterns
-    print("Extracting anti-patterns...")
-    cred_patterns = find_credential_antipatterns(messages)
-    retry_patterns = find_retry_without_diagnosis(messages)
-    scope_patterns = find_scope_creep(messages)
-    verify_patterns = find_missing_verification(messages)
-    tool_opps = find_tool_opportunities(messages)
-    timeline = extract_conversation_timeline(messages)
-
-    # Generate report
-    report_lines = []
-
-    # Header
-    report_lines.append(f"# Conversation Retrospective: {conv_id}")
-    report_lines.append("")
-    report_lines.append(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    report_lines.append(f"**Conversation File:** `{conversation_file}`")
-    report_lines.append("")
-    report_lines.append("---")
-    report_lines.append("")
-
-    # Executive Summary
-    report_lines.append("## Executive Summary")
-    report_lines.append("")
-    report_lines.append("### Top Anti-Patterns Found")
-    report_lines.append("")
-    report_lines.append(f"1. **Retry-Without-Diagnosis**: {len(retry_patterns)} instances")
-    report_lines.append(f"2. **Credential Assumptions**: {len(cred_patterns)} instances")
-    report_lines.append(f"3. **Scope Expansions**: {len(scope_patterns)} instances")
-    report_lines.append(f"4. **Unverified Values**: {len(verify_patterns)} instances")
-    report_lines.append(f"5. **Tool Discovery Gaps**: {len(stats.file_writes)} scripts written (potential duplicates)")
-    report_lines.append("")
-
-    report_lines.append("### Top Tool Opportunities")
-    report_lines.append("")
-    tool_opp_count = 0
-    for cmd, count in stats.repeated_commands.most_common(10):
-        if count >= 3 and not is_normal_dev_command(cmd):
-            tool_opp_count += 1
-            tool_name = f"myproject-{cmd.split()[0] if cmd.split() else 'cmd'}"
-            report_lines.append(f"{tool_opp_count}. **Repeated {count}x**: `{cmd[:80]}...` → Tool: `{tool_name}`")
-            if tool_opp_count >= 5:
-                break
-    if tool_opp_count == 0:
-        report_lines.append("- None identified (repeated commands are normal dev patterns)")
-    report_lines.append("")
-
-    report_lines.append("### Top Universal Rules Violated")
-    report_lines.append("")
-    if len(retry_patterns) > 0:
-        report_lines.append(f"- **Rule 2** (diagnose before retry): {len(retry_patterns)} violations")
-    if len(cred_patterns) > 0:
-        report_lines.append(f"- **Rule 1** (never hardcode creds): {len(cred_patterns)} violations")
-    if len(scope_patterns) > 0:
-        report_lines.append(f"- **Rule 3** (ask before scope expansion): {len(scope_patterns)} violations")
-    if len(verify_patterns) > 0:
-        report_lines.append(f"- **Rule 6** (verify external values): {len(verify_patterns)} violations")
-    report_lines.append("")
-    report_lines.append("---")
-    report_lines.append("")
-
-    # Conversation Summary
-    report_lines.append("## Conversation Summary")
-    report_lines.append("")
-    report_lines.append(f"- **Total Turns**: {stats.total_turns}")
-    report_lines.append(f"- **User Messages**: {len(stats.user_messages)}")
-    report_lines.append(f"- **Assistant Messages**: {len(stats.assistant_messages)}")
-    report_lines.append(f"- **Bash Commands**: {len(stats.bash_commands)}")
-    report_lines.append(f"- **Files Read**: {len(stats.file_reads)}")
-    report_lines.append(f"- **Files Written**: {len(stats.file_writes)}")
-    report_lines.append(f"- **Files Edited**: {len(stats.file_edits)}")
-    report_lines.append("")
-    report_lines.append("---")
-    report_lines.append("")
-
-    # Anti-Patterns Found
-    report_lines.append("## Anti-Patterns Found")
-    report_lines.append("")
-
-    # Retry-without-diagnosis
-    if retry_patterns:
-        report_lines.append("### 1. Retry-Without-Diagnosis")
-        report_lines.append("")
-        report_lines.append(f"**Found**: {len(retry_patterns)} instances")
-        report_lines.append("")
-        report_lines.append("**What Happened**: Commands were retried without checking logs/events between attempts.")
-        report_lines.append("")
-        report_lines.append("**Examples**:")
-        for i, p in enumerate(retry_patterns[:5], 1):
-            report_lines.append(f"{i}. Command: `{p['command']}`")
-            report_lines.append(f"   - First attempt: Message {p['first_attempt']}")
-            report_lines.append(f"   - Retry attempt: Message {p['retry_attempt']}")
-            report_lines.append(f"   - Issue: {p['evidence']}")
-        report_lines.append("")
-        report_lines.append("**Fix**: Always run diagnostics before retry:")
-        report_lines.append("```bash")
-        report_lines.append("# Before retrying, check:")
-        report_lines.append("kubectl logs <resource>")
-        report_lines.append("kubectl describe <resource>")
-        report_lines.append("kubectl get events --sort-by='.lastTimestamp'")
-        report_lines.append("```")
-        report_lines.append("")
-
-    # Credential anti-patterns
-    if cred_patterns:
-        report_lines.append("### 2. Credential Assumptions")
-        report_lines.append("")
-        report_lines.append(f"**Found**: {len(cred_patterns)} instances")
-        report_lines.append("")
-        report_lines.append("**What Happened**: Passwords/secrets used without reading from K8s secrets.")
-        report_lines.append("")
-        report_lines.append("**Examples**:")
-        for i, p in enumerate(cred_patterns[:3], 1):
-            report_lines.append(f"{i}. Type: {p['type']}")
-            report_lines.append(f"   - Evidence: {p.get('evidence', 'N/A')}")
-            report_lines.append(f"   - Context: {p['context'][:150]}...")
-        report_lines.append("")
-        report_lines.append("**Fix**: Always read from K8s secrets:")
-        report_lines.append("```bash")
-        report_lines.append("kubectl get secret <name> -o jsonpath='{.data.password}' | base64 -d")
-        report_lines.append("# Or use: myproject-creds get <secret> --namespace <ns>")
-        report_lines.append("```")
-        report_lines.append("")
-
-    # Scope creep
-    if scope_patterns:
-        report_lines.append("### 3. Scope Expansions")
-        report_lines.append("")
-        report_lines.append(f"**Found**: {len(scope_patterns)} instances")
-        report_lines.append("")
-        report_lines.append("**What Happened**: Task scope expanded beyond original request without asking user.")
-        report_lines.append("")
-        report_lines.append("**Examples**:")
-        for i, p in enumerate(scope_patterns[:3], 1):
-            report_lines.append(f"{i}. Original request: {p['original_request']}")
-            report_lines.append(f"   - Expansion: {p['expansion']}")
-        report_lines.append("")
-        report_lines.append("**Fix**: Stop and ask before expanding scope:")
-        report_lines.append("> \"Encountered blocker: [X]. This is outside the original task scope. Should I:")
-        report_lines.append("> a) Fix it now (expands scope)")
-        report_lines.append("> b) Document it and continue")
-        report_lines.append("> c) Stop here\"")
-        report_lines.append("")
-
-    # Unverified values
-    if verify_patterns:
-        report_lines.append("### 4. Unverified External Values")
-        report_lines.append("")
-        report_lines.append(f"**Found**: {len(verify_patterns)} instances")
-        report_lines.append("")
-        report_lines.append("**What Happened**: IP addresses or URLs used without verification.")
-        report_lines.append("")
-        report_lines.append("**Examples**:")
-        for i, p in enumerate(verify_patterns[:3], 1):
-            report_lines.append(f"{i}. Type: {p['type']}")
-            report_lines.append(f"   - Value: {p.get('evidence', 'N/A')}")
-            report_lines.append(f"   - Context: {p['context'][:100]}...")
-        report_lines.append("")
-        report_lines.append("**Fix**: Always verify external values:")
-        report_lines.append("```bash")
-        report_lines.append("# For cluster IPs:")
-        report_lines.append("docker inspect <container> | jq -r '.[0].NetworkSettings.Networks.kind.IPAddress'")
-        report_lines.append("# For service URLs:")
-        report_lines.append("kubectl get svc <name> -o jsonpath='{.status.loadBalancer.ingress[0].ip}'")
-        report_lines.append("```")
-        report_lines.append("")
-
-    report_lines.append("---")
-    report_lines.append("")
-
-    # Tool Opportunities
-    report_lines.append("## Tool Opportunities")
-    report_lines.append("")
-    report_lines.append("Commands repeated 3+ times that may benefit from automation:")
-    report_lines.append("")
-
-    actionable_tool_opps = []
-    for cmd, count in stats.repeated_commands.most_common(10):
-        if count >= 3 and not is_normal_dev_command(cmd):
-            tool_name = f"myproject-{cmd.split()[0]}" if cmd.split() else "myproject-cmd"
-            report_lines.append(f"- **{count}x**: `{cmd[:80]}` → Tool: `{tool_name}`")
-            actionable_tool_opps.append((cmd, count))
-
-    if not actionable_tool_opps:
-        report_lines.append("- None identified (all repeated commands are normal dev patterns like git, pytest)")
-        report_lines.append("")
-        report_lines.append("**Note**: Commands like `git status`, `pytest`, etc. are expected to repeat")
-        report_lines.append("during normal development and don't indicate tooling gaps.")
-
-    report_lines.append("")
-    report_lines.append("**Repeated Command Sequences**:")
-    if tool_opps['repeated_sequences']:
-        for seq_info in tool_opps['repeated_sequences']:
-            report_lines.append(f"- **{seq_info['count']}x**: `{seq_info['sequence'][:100]}`")
-            report_lines.append(f"  → Potential tool: `{seq_info['tool_name']}`")
-    else:
-        report_lines.append("- None found (single commands only)")
-    report_lines.append("")
-    report_lines.append("---")
-    report_lines.append("")
-
-    # Recommendations
-    report_lines.append("## Recommendations")
-    report_lines.append("")
-
-    high_priority_items = []
-    medium_priority_items = []
-
-    # HIGH priority - based on actual findings
-    if len(retry_patterns) >= 5:
-        high_priority_items.append(
-            "**Implement `myproject-diag`** - Automated diagnostics before retry\n"
-            f"   - Would have prevented: {len(retry_patterns)} retry-without-diagnosis instances"
-        )
-    if len(cred_patterns) > 0:
-        high_priority_items.append(
-            "**Implement `myproject-creds`** - Safe credential retrieval\n"
-            f"   - Would have prevented: {len(cred_patterns)} credential anti-patterns"
-        )
-    if len(stats.bash_commands) > 100 and len(stats.errors) > 10:
-        high_priority_items.append(
-            "**Implement `myproject-preflight`** - Pre-test validation\n"
-            "   - Would have prevented: Failed test runs due to environment issues"
+    # Analysis results are cached on disk keyed by (id, mtime, size); a
+    # re-run on an unchanged transcript skips straight to report building
+    file_stat = os.stat(conversation_file)
+    cache_key = hashlib.blake2b(
+        f"{conv_id}:{file_stat.st_mtime}:{file_stat.st_size}".encode()
+    ).hexdigest()
+    cache_dir = _DEFAULT_RETRO_DIR / '.cache'
+    cache_file = cache_dir / f"{cache_key}.pkl"
+
+    analysis = None
+    try:
+        with open(cache_file, 'rb') as cf:
+            analysis = pickle.load(cf)
+    except (OSError, pickle.PickleError, EOFError):
+        pass
+
+    if analysis is None:
+        # Run analysis; parse the JSONL once and share the messages across
+        # the analyzer and every pattern detector below
+        print(f"Analyzing conversation: {conv_id}...")
+        messages = load_messages(conversation_file)
+        stats = analyze_messages(messages)
+
+        # Extract detailed patterns; the text list is shared so each
+        # message's content is joined exactly once
+        print("Extracting anti-patterns...")
+        texts = precompute_texts(messages)
+        analysis = (
+            stats,
+            find_credential_antipatterns(messages, limit=3, texts=texts),
+            find_retry_without_diagnosis(messages, limit=5, texts=texts),
+            find_scope_creep(messages, limit=3, texts=texts),
+            find_missing_verification(messages, limit=3, texts=texts),
+            find_tool_opportunities(messages),
+            extract_conversation_timeline(messages),
         )
 
-    # MEDIUM priority - context-aware (only suggest if not already present)
-    if not project_context['has_tools_doc'] and not project_context['has_claude_md']:
-        medium_priority_items.append(
-            "**Create `TOOLS.md` or `CLAUDE.md`** - Document available tools for discoverability"
-        )
+        # Write-then-rename keeps readers from ever seeing a partial pickle
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_dir / f"{cache_key}.pkl.tmp"
+        with open(tmp_file, 'wb') as cf:
+            pickle.dump(analysis, cf, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    else:
+        print(f"Analyzing conversation: {conv_id}... (cached)")
 
-    if not project_context['has_project_cli'] and actionable_tool_opps:
-        medium_priority_items.append(
-            "**Consider unified CLI** - Consolidate repeated command patterns into tools"
-        )
+    (stats,
+     (cred_patterns, cred_total),
+     (retry_patterns, retry_total),
+     (scope_patterns, scope_total),
+     (verify_patterns, verify_total),
+     tool_opps,
+     timeline) = analysis
 
-    if len(scope_patterns) > 3:
-        medium_priority_items.append(
-            "**Update workflow** - Add explicit scope confirmation checkpoints"
-        )
+    # Check project context for existing tools/docs
+    project_context = check_project_context(conversation_file)
 
-    report_lines.append("### Priority 1 (HIGH) - Immediate Action")
-    report_lines.append("")
-    if high_priority_items:
-        for i, item in enumerate(high_priority_items, 1):
-            report_lines.append(f"{i}. {item}")
-    else:
-        report_lines.append("- None identified - conversation followed good practices")
-    report_lines.append("")
-
-    report_lines.append("### Priority 2 (MEDIUM) - Short-Term")
-    report_lines.append("")
-    if medium_priority_items:
-        for i, item in enumerate(medium_priority_items, 1):
-            report_lines.append(f"{i}. {item}")
-    else:
-        report_lines.append("- None identified - project already has good tooling/documentation")
-    report_lines.append("")
-
-    report_lines.append("### Priority 3 (LOW) - Long-Term")
-    report_lines.append("")
-    report_lines.append("1. **Add telemetry** - Track anti-pattern occurrences over time")
-    report_lines.append("2. **Build metrics dashboard** - Visualize improvement trends")
-    report_lines.append("3. **Continuous learning loop** - Feed learnings back into `/check-antipatterns`")
-    report_lines.append("")
-    report_lines.append("---")
-    report_lines.append("")
-
-    # Success Metrics
-    report_lines.append("## Success Metrics")
-    report_lines.append("")
-    report_lines.append("| Metric | Current | Target |")
-    report_lines.append("|--------|---------|--------|")
-    report_lines.append(f"| Retry-without-diagnosis | {len(retry_patterns)} | 0 |")
-    report_lines.append(f"| Hardcoded credentials | {len(cred_patterns)} | 0 |")
-    report_lines.append(f"| Scope expansions without asking | {len(scope_patterns)} | 0 |")
-    report_lines.append(f"| Unverified values | {len(verify_patterns)} | 0 |")
-    report_lines.append(f"| Manual command sequences | {len(stats.bash_commands)} | <50 (with tooling) |")
-    report_lines.append("")
-
-    # Calculate compliance score
-    total_violations = len(retry_patterns) + len(cred_patterns) + len(scope_patterns) + len(verify_patterns)
-    total_opportunities = total_violations + 15  # 15 universal rules
-    compliance_score = int(((total_opportunities - total_violations) / total_opportunities) * 100) if total_opportunities > 0 else 100
-
-    report_lines.append(f"**Compliance Score**: {compliance_score}% (Target: 95%+)")
-    report_lines.append("")
-    report_lines.append("---")
-    report_lines.append("")
-
-    # Footer
-    report_lines.append(f"*Report generated by `/analyze-conversation` skill*")
-    report_lines.append(f"*For real-time anti-pattern detection, use `/check-antipatterns`*")
-
-    # Write report
+    # Filter before ranking so the heap selection only compares commands
+    # that can actually become tool opportunities; both report sections
+    # reuse this
+    actionable_tool_opps = nlargest(
+        10,
+        ((cmd, count) for cmd, count in stats.repeated_commands.items()
+         if count >= 3 and not is_normal_dev_command_lower(cmd.lower().strip())),
+        key=itemgetter(1)
+    )
+
+    # Stream the report straight to disk; no intermediate line list
     report_file = output_dir / f"{conv_id}_retrospective.md"
-    with open(report_file, 'w') as f:
-        f.write('\n'.join(report_lines))
+    with open(report_file, 'w', buffering=1 << 16) as f:
+
+        def emit(line=''):
+            f.write(line)
+            f.write('\n')
+
+        # Header
+        f.write(f"""# Conversation Retrospective: {conv_id}
+
+**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+**Conversation File:** `{conversation_file}`
+
+---
+
+## Executive Summary
+
+### Top Anti-Patterns Found
+
+1. **Retry-Without-Diagnosis**: {retry_total} instances
+2. **Credential Assumptions**: {cred_total} instances
+3. **Scope Expansions**: {scope_total} instances
+4. **Unverified Values**: {verify_total} instances
+5. **Tool Discovery Gaps**: {stats.file_write_count} scripts written (potential duplicates)
+
+### Top Tool Opportunities
+
+""")
+        for tool_opp_count, (cmd, count) in enumerate(actionable_tool_opps[:5], 1):
+            snippet, tool_name = _opp_row(cmd)
+            emit(f"{tool_opp_count}. **Repeated {count}x**: `{snippet}...` → Tool: `{tool_name}`")
+        if not actionable_tool_opps:
+            emit("- None identified (repeated commands are normal dev patterns)")
+        emit()
+
+        emit("### Top Universal Rules Violated")
+        emit()
+        if retry_total > 0:
+            emit(f"- **Rule 2** (diagnose before retry): {retry_total} violations")
+        if cred_total > 0:
+            emit(f"- **Rule 1** (never hardcode creds): {cred_total} violations")
+        if scope_total > 0:
+            emit(f"- **Rule 3** (ask before scope expansion): {scope_total} violations")
+        if verify_total > 0:
+            emit(f"- **Rule 6** (verify external values): {verify_total} violations")
+        emit()
+        emit("---")
+        emit()
+
+        # Conversation Summary
+        f.write(f"""## Conversation Summary
+
+- **Total Turns**: {stats.total_turns}
+- **User Messages**: {stats.user_message_count}
+- **Assistant Messages**: {stats.assistant_message_count}
+- **Bash Commands**: {len(stats.bash_commands)}
+- **Files Read**: {stats.file_read_count}
+- **Files Written**: {stats.file_write_count}
+- **Files Edited**: {stats.file_edit_count}
+
+---
+
+## Anti-Patterns Found
+
+""")
+
+        # Retry-without-diagnosis
+        if retry_patterns:
+            f.write(f"""### 1. Retry-Without-Diagnosis
+
+**Found**: {retry_total} instances
+
+**What Happened**: Commands were retried without checking logs/events between attempts.
+
+**Examples**:
+""")
+            for i, p in enumerate(retry_patterns, 1):
+                emit(f"{i}. Command: `{p['command']}`")
+                emit(f"   - First attempt: Message {p['first_attempt']}")
+                emit(f"   - Retry attempt: Message {p['retry_attempt']}")
+                emit(f"   - Issue: {p['evidence']}")
+            f.write("""
+**Fix**: Always run diagnostics before retry:
+```bash
+# Before retrying, check:
+kubectl logs <resource>
+kubectl describe <resource>
+kubectl get events --sort-by='.lastTimestamp'
+```
+
+""")
+
+        # Credential anti-patterns
+        if cred_patterns:
+            f.write(f"""### 2. Credential Assumptions
+
+**Found**: {cred_total} instances
+
+**What Happened**: Passwords/secrets used without reading from K8s secrets.
+
+**Examples**:
+""")
+            for i, p in enumerate(cred_patterns, 1):
+                emit(f"{i}. Type: {p['type']}")
+                emit(f"   - Evidence: {p.get('evidence', 'N/A')}")
+                emit(f"   - Context: {p['context'][:150]}...")
+            f.write("""
+**Fix**: Always read from K8s secrets:
+```bash
+kubectl get secret <name> -o jsonpath='{.data.password}' | base64 -d
+# Or use: myproject-creds get <secret> --namespace <ns>
+```
+
+""")
+
+        # Scope creep
+        if scope_patterns:
+            f.write(f"""### 3. Scope Expansions
+
+**Found**: {scope_total} instances
+
+**What Happened**: Task scope expanded beyond original request without asking user.
+
+**Examples**:
+""")
+            for i, p in enumerate(scope_patterns, 1):
+                emit(f"{i}. Original request: {p['original_request']}")
+                emit(f"   - Expansion: {p['expansion']}")
+            f.write("""
+**Fix**: Stop and ask before expanding scope:
+> "Encountered blocker: [X]. This is outside the original task scope. Should I:
+> a) Fix it now (expands scope)
+> b) Document it and continue
+> c) Stop here"
+
+""")
+
+        # Unverified values
+        if verify_patterns:
+            f.write(f"""### 4. Unverified External Values
+
+**Found**: {verify_total} instances
+
+**What Happened**: IP addresses or URLs used without verification.
+
+**Examples**:
+""")
+            for i, p in enumerate(verify_patterns, 1):
+                emit(f"{i}. Type: {p['type']}")
+                emit(f"   - Value: {p.get('evidence', 'N/A')}")
+                emit(f"   - Context: {p['context'][:100]}...")
+            f.write("""
+**Fix**: Always verify external values:
+```bash
+# For cluster IPs:
+docker inspect <container> | jq -r '.[0].NetworkSettings.Networks.kind.IPAddress'
+# For service URLs:
+kubectl get svc <name> -o jsonpath='{.status.loadBalancer.ingress[0].ip}'
+```
+
+""")
+
+        f.write("""---
+
+## Tool Opportunities
+
+Commands repeated 3+ times that may benefit from automation:
+
+""")
+
+        for cmd, count in actionable_tool_opps:
+            snippet, tool_name = _opp_row(cmd)
+            emit(f"- **{count}x**: `{snippet}` → Tool: `{tool_name}`")
+
+        if not actionable_tool_opps:
+            f.write("""- None identified (all repeated commands are normal dev patterns like git, pytest)
+
+**Note**: Commands like `git status`, `pytest`, etc. are expected to repeat
+during normal development and don't indicate tooling gaps.
+""")
+
+        emit()
+        emit("**Repeated Command Sequences**:")
+        if tool_opps['repeated_sequences']:
+            for seq_info in tool_opps['repeated_sequences']:
+                emit(f"- **{seq_info['count']}x**: `{seq_info['sequence'][:100]}`")
+                emit(f"  → Potential tool: `{seq_info['tool_name']}`")
+        else:
+            emit("- None found (single commands only)")
+        emit()
+        emit("---")
+        emit()
+
+        # Recommendations
+        emit("## Recommendations")
+        emit()
+
+        high_priority_items = []
+        medium_priority_items = []
+
+        # HIGH priority - based on actual findings
+        if retry_total >= 5:
+            high_priority_items.append(
+                "**Implement `myproject-diag`** - Automated diagnostics before retry\n"
+                f"   - Would have prevented: {retry_total} retry-without-diagnosis instances"
+            )
+        if cred_total > 0:
+            high_priority_items.append(
+                "**Implement `myproject-creds`** - Safe credential retrieval\n"
+                f"   - Would have prevented: {cred_total} credential anti-patterns"
+            )
+        if len(stats.bash_commands) > 100 and len(stats.errors) > 10:
+            high_priority_items.append(
+                "**Implement `myproject-preflight`** - Pre-test validation\n"
+                "   - Would have prevented: Failed test runs due to environment issues"
+            )
+
+        # MEDIUM priority - context-aware (only suggest if not already present)
+        if not project_context['has_tools_doc'] and not project_context['has_claude_md']:
+            medium_priority_items.append(
+                "**Create `TOOLS.md` or `CLAUDE.md`** - Document available tools for discoverability"
+            )
+
+        if not project_context['has_project_cli'] and actionable_tool_opps:
+            medium_priority_items.append(
+                "**Consider unified CLI** - Consolidate repeated command patterns into tools"
+            )
+
+        if scope_total > 3:
+            medium_priority_items.append(
+                "**Update workflow** - Add explicit scope confirmation checkpoints"
+            )
+
+        emit("### Priority 1 (HIGH) - Immediate Action")
+        emit()
+        if high_priority_items:
+            for i, item in enumerate(high_priority_items, 1):
+                emit(f"{i}. {item}")
+        else:
+            emit("- None identified - conversation followed good practices")
+        emit()
+
+        emit("### Priority 2 (MEDIUM) - Short-Term")
+        emit()
+        if medium_priority_items:
+            for i, item in enumerate(medium_priority_items, 1):
+                emit(f"{i}. {item}")
+        else:
+            emit("- None identified - project already has good tooling/documentation")
+        emit()
+
+        f.write("""### Priority 3 (LOW) - Long-Term
+
+1. **Add telemetry** - Track anti-pattern occurrences over time
+2. **Build metrics dashboard** - Visualize improvement trends
+3. **Continuous learning loop** - Feed learnings back into `/check-antipatterns`
+
+---
+
+""")
+
+        # Success Metrics
+        f.write(f"""## Success Metrics
+
+| Metric | Current | Target |
+|--------|---------|--------|
+| Retry-without-diagnosis | {retry_total} | 0 |
+| Hardcoded credentials | {cred_total} | 0 |
+| Scope expansions without asking | {scope_total} | 0 |
+| Unverified values | {verify_total} | 0 |
+| Manual command sequences | {len(stats.bash_commands)} | <50 (with tooling) |
+
+""")
+
+        # Calculate compliance score
+        total_violations = retry_total + cred_total + scope_total + verify_total
+        total_opportunities = total_violations + 15  # 15 universal rules
+        compliance_score = (100 * (total_opportunities - total_violations)) // max(total_opportunities, 1)
+
+        f.write(f"""**Compliance Score**: {compliance_score}% (Target: 95%+)
+
+---
+
+*Report generated by `/analyze-conversation` skill*
+*For real-time anti-pattern detection, use `/check-antipatterns`*
+""")
 
     print(f"\n✅ Report generated: {report_file}")
     return str(report_file)
@@ -3,18 +3,45 @@
 Deep anti-pattern analysis - extracts specific instances of problematic behaviors.
 """
 
-import json
 import re
+from collections import deque
 from typing import List, Dict, Tuple
 
+try:
+    import orjson as json  # ~5x faster JSON parsing when available
+except ImportError:
+    import json
+
+# Compiled once at import; the find_* scanners run per message.
+# One pattern both detects the assignment and captures the quoted value,
+# replacing a separate search + findall pair.
+_PW_RE = re.compile(r'password\s*=\s*["\'](?P<val>[^"\']*)["\']', re.IGNORECASE)
+# Fused alternation: IPs and service URLs are collected in one linear
+# scan. The url branch is a zero-width lookahead so an IP inside a URL
+# is still reported by the ip branch.
+_IP_URL_RE = re.compile(
+    r'(?P<url>(?=http://[^\s]+:\d+))'
+    r'|(?P<ip>\d{1,3}(?:\.\d{1,3}){3})'
+)
+_URL_EVIDENCE_RE = re.compile(r'http://[^\s]+:\d+')
+# Diagnosis markers fused into one alternation (case-sensitive, matching
+# the original keyword checks)
+_DIAGNOSIS_KW_RE = re.compile(
+    r'kubectl logs|kubectl describe|kubectl get events|error|failed|traceback'
+)
+# Scope-expansion indicators fused into one alternation; the containing
+# sentence is recovered by scanning to the nearest period on either side
+_SCOPE_EXPANSION_RE = re.compile(
+    r'also create|also build|also implement|also add'
+    r'|we should also|let me also|additionally|i will also|we need to also'
+)
+
+
 def load_messages(filepath: str) -> List[Dict]:
     """Load JSONL conversation."""
-    messages = []
-    with open(filepath, 'r') as f:
-        for line in f:
-            if line.strip():
-                messages.append(json.loads(line))
-    return messages
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    return [json.loads(line) for line in data.splitlines() if line]
 
 
 def extract_text(content) -> str:
@@ -31,30 +58,62 @@ def extract_text(content) -> str:
     return ''
 
 
-def find_credential_antipatterns(messages: List[Dict]) -> List[Dict]:
-    """Find instances where credentials were hardcoded or assumed."""
+def precompute_texts(messages: List[Dict]) -> List[str]:
+    """Extract every message's text once.
+
+    Each detector walks the same messages; sharing one text list avoids
+    re-joining the content blocks once per detector.
+    """
+    return [extract_text(m.get('message', {}).get('content', '')) for m in messages]
+
+
+def find_credential_antipatterns(messages: List[Dict], limit: int = None,
+                                 texts: List[str] = None) -> Tuple[List[Dict], int]:
+    """Find instances where credentials were hardcoded or assumed.
+
+    Returns (findings, total). When `limit` is set, at most that many
+    findings are collected but `total` keeps the true count, so callers
+    that only show a few examples stay bounded in memory. `texts` takes
+    a precompute_texts result shared across detectors.
+    """
+    if texts is None:
+        texts = precompute_texts(messages)
     findings = []
+    total = 0
+
+    def record(finding):
+        nonlocal total
+        total += 1
+        if limit is None or len(findings) < limit:
+            findings.append(finding)
 
     for i, msg in enumerate(messages):
         if msg.get('type') != 'assistant':
             continue
 
-        content = extract_text(msg.get('message', {}).get('content', ''))
-
-        # Pattern 1: Hardcoded passwords
-        if re.search(r'password\s*=\s*["\'].*["\']', content, re.IGNORECASE):
-            findings.append({
+        content = texts[i]
+
+        # Pattern 1: Hardcoded passwords (empty-valued assignments still
+        # flag the message; they just contribute no evidence string)
+        pw_evidence = None
+        for m in _PW_RE.finditer(content):
+            if pw_evidence is None:
+                pw_evidence = []
+            if m.group('val'):
+                pw_evidence.append(m.group())
+        if pw_evidence is not None:
+            record({
                 'type': 'HARDCODED_PASSWORD',
                 'index': i,
                 'timestamp': msg.get('timestamp', ''),
-                'evidence': re.findall(r'password\s*=\s*["\'][^"\']+["\']', content, re.IGNORECASE),
+                'evidence': pw_evidence,
                 'context': content[:300]
             })
 
         # Pattern 2: Using credentials without reading from secrets
         if 'PASSWORD' in content and 'kubectl get secret' not in content:
             if any(keyword in content for keyword in ['export', 'DATA_PLANE_DB_PASSWORD', 'DB_PASSWORD']):
-                findings.append({
+                record({
                     'type': 'ASSUMED_CREDENTIAL',
                     'index': i,
                     'timestamp': msg.get('timestamp', ''),
@@ -62,7 +121,7 @@ def find_credential_antipatterns(messages: List[Dict]) -> List[Dict]:
                     'context': content[:300]
                 })
 
-    return findings
+    return findings, total
 
 
 # Commands where retries are normal (test-fix-test cycles, status checks)
@@ -75,24 +134,37 @@ NORMAL_RETRY_COMMANDS = {
 }
 
 
+# str.startswith accepts a tuple and evaluates the whole disjunction in C
+_NORMAL_RETRY_TUPLE = tuple(sorted(NORMAL_RETRY_COMMANDS, key=len, reverse=True))
+
+
 def is_normal_retry_command(cmd: str) -> bool:
     """Check if command is expected to be retried (test cycles, etc.)."""
-    cmd_lower = cmd.lower().strip()
-    for normal_cmd in NORMAL_RETRY_COMMANDS:
-        if cmd_lower.startswith(normal_cmd):
-            return True
-    return False
+    return cmd.lower().strip().startswith(_NORMAL_RETRY_TUPLE)
 
 
-def find_retry_without_diagnosis(messages: List[Dict]) -> List[Dict]:
+def find_retry_without_diagnosis(messages: List[Dict], limit: int = None,
+                                 texts: List[str] = None) -> Tuple[List[Dict], int]:
     """Find retry attempts without investigating root cause.
 
     Excludes normal test-fix-test cycles and status check commands.
+    Returns (findings, total); see find_credential_antipatterns.
     """
+    if texts is None:
+        texts = precompute_texts(messages)
     findings = []
+    total = 0
 
-    # Track command sequences
-    recent_commands = []
+    # Flag diagnosis markers per message once; the prefix sum turns the
+    # "was anything diagnosed between the attempts?" scan into O(1)
+    psum = [0] * (len(messages) + 1)
+    for k, text in enumerate(texts):
+        psum[k + 1] = psum[k] + (1 if _DIAGNOSIS_KW_RE.search(text) else 0)
+
+    # Last five commands as parallel deques (SoA); the retry check
+    # compares plain strings instead of walking per-command dicts
+    recent_cmds = deque(maxlen=5)
+    recent_idx = deque(maxlen=5)
 
     for i, msg in enumerate(messages):
         if msg.get('type') != 'assistant':
@@ -106,44 +178,43 @@ def find_retry_without_diagnosis(messages: List[Dict]) -> List[Dict]:
         for item in msg_content:
             if isinstance(item, dict) and item.get('name') == 'Bash':
                 cmd = item.get('input', {}).get('command', '')
-                recent_commands.append({
-                    'cmd': cmd,
-                    'index': i,
-                    'timestamp': msg.get('timestamp', '')
-                })
 
-                # Skip normal retry commands (test cycles, status checks)
-                if is_normal_retry_command(cmd):
-                    continue
-
-                # Check if this is a retry (same command within last 5 commands)
-                if len(recent_commands) >= 2:
-                    for prev in recent_commands[-6:-1]:
-                        if prev['cmd'] == cmd:
+                # Check if this is a retry (same command within last 5
+                # commands), skipping normal test cycles / status checks
+                if not is_normal_retry_command(cmd):
+                    for prev_cmd, prev_idx in zip(recent_cmds, recent_idx):
+                        if prev_cmd == cmd:
                             # Check if there was diagnosis between attempts
-                            checked_logs = False
-                            for check_msg in messages[prev['index']:i]:
-                                check_content = extract_text(check_msg.get('message', {}).get('content', ''))
-                                if any(word in check_content for word in ['kubectl logs', 'kubectl describe', 'kubectl get events', 'error', 'failed', 'traceback']):
-                                    checked_logs = True
-                                    break
+                            checked_logs = psum[i] - psum[prev_idx] > 0
 
                             if not checked_logs:
-                                findings.append({
-                                    'type': 'RETRY_WITHOUT_DIAGNOSIS',
-                                    'command': cmd[:100],
-                                    'first_attempt': prev['index'],
-                                    'retry_attempt': i,
-                                    'timestamp': msg.get('timestamp', ''),
-                                    'evidence': f'Retried command without checking logs/events'
-                                })
+                                total += 1
+                                if limit is None or len(findings) < limit:
+                                    findings.append({
+                                        'type': 'RETRY_WITHOUT_DIAGNOSIS',
+                                        'command': cmd[:100],
+                                        'first_attempt': prev_idx,
+                                        'retry_attempt': i,
+                                        'timestamp': msg.get('timestamp', ''),
+                                        'evidence': f'Retried command without checking logs/events'
+                                    })
+
+                recent_cmds.append(cmd)
+                recent_idx.append(i)
 
-    return findings
+    return findings, total
 
 
-def find_scope_creep(messages: List[Dict]) -> List[Dict]:
-    """Find instances where scope expanded beyond original request."""
+def find_scope_creep(messages: List[Dict], limit: int = None,
+                     texts: List[str] = None) -> Tuple[List[Dict], int]:
+    """Find instances where scope expanded beyond original request.
+
+    Returns (findings, total); see find_credential_antipatterns.
+    """
+    if texts is None:
+        texts = precompute_texts(messages)
     findings = []
+    total = 0
 
     # Track user requests and assistant responses
     current_request = None
@@ -151,73 +222,98 @@ def find_scope_creep(messages: List[Dict]) -> List[Dict]:
 
     for i, msg in enumerate(messages):
         if msg.get('type') == 'user':
-            current_request = extract_text(msg.get('message', {}).get('content', ''))
+            current_request = texts[i]
             current_request_idx = i
 
         elif msg.get('type') == 'assistant' and current_request:
-            content = extract_text(msg.get('message', {}).get('content', ''))
+            content = texts[i]
+            content_lower = content.lower()
+
+            # One linear scan locates every expansion indicator; the
+            # sentence boundaries come from the surrounding periods
+            for m in _SCOPE_EXPANSION_RE.finditer(content_lower):
+                start = content_lower.rfind('.', 0, m.start()) + 1
+                end = content_lower.find('.', m.end())
+                sent = content[start:end if end != -1 else len(content)]
+                total += 1
+                if limit is None or len(findings) < limit:
+                    findings.append({
+                        'type': 'SCOPE_EXPANSION',
+                        'original_request': current_request[:200],
+                        'expansion': sent.strip()[:300],
+                        'request_index': current_request_idx,
+                        'expansion_index': i,
+                        'timestamp': msg.get('timestamp', '')
+                    })
 
-            # Keywords indicating scope expansion
-            expansion_indicators = [
-                'also create', 'also build', 'also implement', 'also add',
-                'we should also', 'let me also', 'additionally',
-                'I will also', 'we need to also'
-            ]
-
-            for indicator in expansion_indicators:
-                if indicator in content.lower():
-                    # Extract the sentence
-                    sentences = content.split('.')
-                    for sent in sentences:
-                        if indicator in sent.lower():
-                            findings.append({
-                                'type': 'SCOPE_EXPANSION',
-                                'original_request': current_request[:200],
-                                'expansion': sent.strip()[:300],
-                                'request_index': current_request_idx,
-                                'expansion_index': i,
-                                'timestamp': msg.get('timestamp', '')
-                            })
-
-    return findings
-
-
-def find_missing_verification(messages: List[Dict]) -> List[Dict]:
-    """Find cases where values were used without verification."""
+    return findings, total
+
+
+def find_missing_verification(messages: List[Dict], limit: int = None,
+                              texts: List[str] = None) -> Tuple[List[Dict], int]:
+    """Find cases where values were used without verification.
+
+    Returns (findings, total); see find_credential_antipatterns.
+    """
+    if texts is None:
+        texts = precompute_texts(messages)
     findings = []
+    total = 0
+
+    def record(finding):
+        nonlocal total
+        total += 1
+        if limit is None or len(findings) < limit:
+            findings.append(finding)
 
     for i, msg in enumerate(messages):
         if msg.get('type') != 'assistant':
             continue
 
-        content = extract_text(msg.get('message', {}).get('content', ''))
+        content = texts[i]
+
+        # Cheap substring gates: most messages carry neither an IP-like
+        # dot cluster nor a service URL, so they skip the regex entirely
+        if not ('http://' in content
+                or (content.count('.') >= 3 and any(c.isdigit() for c in content))):
+            continue
+
+        # One fused scan collects both evidence kinds; the per-type
+        # gating below then runs on plain substring checks
+        ips = []
+        urls = []
+        for m in _IP_URL_RE.finditer(content):
+            if m.lastgroup == 'ip':
+                ips.append(m.group())
+            else:
+                urls.append(_URL_EVIDENCE_RE.match(content, m.start()).group())
 
         # Pattern: Using IP addresses without verifying
-        if re.search(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}', content):
+        if ips:
             if 'docker inspect' not in content and 'kubectl get' not in content:
                 # Check if IP is being SET rather than READ
                 if any(keyword in content for keyword in ['export', 'PLANE_URL=', '  url:', 'endpoint:']):
-                    findings.append({
+                    record({
                         'type': 'UNVERIFIED_IP_USAGE',
-                        'evidence': re.findall(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}', content),
+                        'evidence': ips,
                         'index': i,
                         'timestamp': msg.get('timestamp', ''),
                         'context': content[:300]
                     })
 
         # Pattern: Using service URLs without checking availability
-        if re.search(r'http://.*:\d+', content):
+        if urls:
             if 'curl' not in content and 'requests.get' not in content and 'await' not in content:
                 if 'export' in content or '=' in content:
-                    findings.append({
+                    record({
                         'type': 'UNVERIFIED_SERVICE_URL',
-                        'evidence': re.findall(r'http://[^\s]+:\d+', content),
+                        'evidence': urls,
                         'index': i,
                         'timestamp': msg.get('timestamp', ''),
                         'context': content[:200]
                     })
 
-    return findings
+    return findings, total
 
 
 def extract_conversation_timeline(messages: List[Dict]) -> List[Tuple[str, str, str]]:
@@ -269,22 +365,20 @@ def find_tool_opportunities(messages: List[Dict]) -> Dict[str, List]:
                 sequences.append(current_sequence[:])
             current_sequence = []
 
-    # Find repeated sequences
+    # Find repeated sequences; tuples hash directly, so the join cost is
+    # only paid for the few sequences that get rendered
     from collections import Counter
-    seq_counter = Counter()
-    for seq in sequences:
-        if len(seq) >= 2:
-            seq_key = ' && '.join(seq)
-            if len(seq_key) < 200:
-                seq_counter[seq_key] += 1
-
-    for seq, count in seq_counter.most_common(10):
+    seq_counter = Counter(tuple(seq) for seq in sequences if len(seq) >= 2)
+
+    for seq_tuple, count in seq_counter.most_common(10):
         if count >= 2:
-            opportunities['repeated_sequences'].append({
-                'sequence': seq,
-                'count': count,
-                'tool_name': f'myproject-{seq.split()[0].replace("kubectl", "k8s").replace("docker", "docker")}'
-            })
+            seq_str = ' && '.join(seq_tuple)
+            if len(seq_str) < 200:
+                opportunities['repeated_sequences'].append({
+                    'sequence': seq_str,
+                    'count': count,
+                    'tool_name': f'myproject-{seq_str.split()[0].replace("kubectl", "k8s").replace("docker", "docker")}'
+                })
 
     return opportunities
 
@@ -297,6 +391,7 @@ if __name__ == '__main__':
 
     filepath = sys.argv[1]
     messages = load_messages(filepath)
+    texts = precompute_texts(messages)
 
     print("=" * 80)
     print("DEEP ANTI-PATTERN ANALYSIS")
@@ -313,8 +408,8 @@ if __name__ == '__main__':
     # Credential anti-patterns
     print("\n\n1. CREDENTIAL ANTI-PATTERNS:")
     print("-" * 80)
-    cred_patterns = find_credential_antipatterns(messages)
-    for p in cred_patterns[:10]:
+    cred_patterns, cred_total = find_credential_antipatterns(messages, limit=10, texts=texts)
+    for p in cred_patterns:
         print(f"\n  Type: {p['type']}")
         print(f"  Timestamp: {p['timestamp']}")
         print(f"  Evidence: {p.get('evidence', 'N/A')}")
@@ -323,8 +418,8 @@ if __name__ == '__main__':
     # Retry without diagnosis
     print("\n\n2. RETRY WITHOUT DIAGNOSIS:")
     print("-" * 80)
-    retry_patterns = find_retry_without_diagnosis(messages)
-    for p in retry_patterns[:10]:
+    retry_patterns, retry_total = find_retry_without_diagnosis(messages, limit=10, texts=texts)
+    for p in retry_patterns:
         print(f"\n  Command: {p['command']}")
         print(f"  First attempt: Message {p['first_attempt']}")
         print(f"  Retry attempt: Message {p['retry_attempt']}")
@@ -333,8 +428,8 @@ if __name__ == '__main__':
     # Scope creep
     print("\n\n3. SCOPE EXPANSION INSTANCES:")
     print("-" * 80)
-    scope_patterns = find_scope_creep(messages)
-    for p in scope_patterns[:10]:
+    scope_patterns, scope_total = find_scope_creep(messages, limit=10, texts=texts)
+    for p in scope_patterns:
         print(f"\n  Original request: {p['original_request']}")
         print(f"  Expansion: {p['expansion']}")
         print(f"  Timestamp: {p['timestamp']}")
@@ -342,8 +437,8 @@ if __name__ == '__main__':
     # Missing verification
     print("\n\n4. MISSING VERIFICATION:")
     print("-" * 80)
-    verify_patterns = find_missing_verification(messages)
-    for p in verify_patterns[:10]:
+    verify_patterns, verify_total = find_missing_verification(messages, limit=10, texts=texts)
+    for p in verify_patterns:
         print(f"\n  Type: {p['type']}")
         print(f"  Evidence: {p.get('evidence', 'N/A')}")
         print(f"  Context: {p['context']}")
@@ -359,8 +454,8 @@ if __name__ == '__main__':
     print("\n\n" + "=" * 80)
     print("SUMMARY COUNTS:")
     print("=" * 80)
-    print(f"  Credential anti-patterns: {len(cred_patterns)}")
-    print(f"  Retry-without-diagnosis: {len(retry_patterns)}")
-    print(f"  Scope expansions: {len(scope_patterns)}")
-    print(f"  Unverified values: {len(verify_patterns)}")
+    print(f"  Credential anti-patterns: {cred_total}")
+    print(f"  Retry-without-diagnosis: {retry_total}")
+    print(f"  Scope expansions: {scope_total}")
+    print(f"  Unverified values: {verify_total}")
     print(f"  Repeated sequences: {len(tool_opps['repeated_sequences'])}")
@@ -4,13 +4,18 @@ Real-time anti-pattern checker for active conversations.
 Entry point for /check-antipatterns skill.
 """
 
-import json
+import mmap
 import sys
 import re
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, deque
 from typing import List, Dict, Tuple
 
+try:
+    import orjson as json  # ~5x faster JSON parsing when available
+except ImportError:
+    import json
+
 # Command taxonomy: distinguish diagnostic vs action commands
 DIAGNOSTIC_COMMANDS = {
     'git status', 'git diff', 'git log',
@@ -52,24 +57,67 @@ E2E_TEST_PATTERNS = [
     r'npm\s+run\s+test:integration'
 ]
 
+# Compiled once at import; the checks below run per command in a loop and
+# re.search with a string literal pays a cache lookup plus parse each call
+CREDENTIAL_PATTERNS_COMPILED = [re.compile(p, re.IGNORECASE) for p in CREDENTIAL_PATTERNS]
+E2E_TEST_PATTERNS_COMPILED = [re.compile(p, re.IGNORECASE) for p in E2E_TEST_PATTERNS]
+
+# Keyword sets fused into one alternation each: a single linear scan of
+# the message replaces one substring search per keyword
+_DIAGNOSTIC_KW_RE = re.compile(
+    r'kubectl logs|kubectl describe|kubectl get events|docker logs|journalctl|cat /var/log'
+)
+_PREFLIGHT_KW_RE = re.compile(
+    r'kubectl get pods|kubectl get svc|docker ps|curl|health|preflight'
+)
+_GOOD_DIAGNOSTIC_KW_RE = re.compile(r'kubectl logs|kubectl describe|kubectl get events')
+_SCOPE_ASK_KW_RE = re.compile(r'should i|do you want me to|this will|this expands')
+# Any kubectl subcommand touching a secret counts as a secret read
+# (matched against already-lowercased text)
+_KUBECTL_SECRET_RE = re.compile(r'kubectl\s+\S*\s*secret')
+
 
 def load_rules() -> Dict:
     """Load universal rules from rules.json."""
     rules_file = Path(__file__).parent / 'rules.json'
-    with open(rules_file, 'r') as f:
-        return json.load(f)
+    with open(rules_file, 'rb') as f:
+        rules = json.loads(f.read())
+    # Index the rules by id once; report generation looks them up per
+    # good practice
+    rules['by_id'] = {r['id']: r for r in rules['universal_rules']}
+    return rules
 
 
 def load_conversation(filepath: str, lookback: int = 50) -> List[Dict]:
     """Load last N messages from conversation JSONL."""
-    messages = []
-    with open(filepath, 'r') as f:
-        for line in f:
-            if line.strip():
-                messages.append(json.loads(line))
-
-    # Return only last N messages for performance
-    return messages[-lookback:] if len(messages) > lookback else messages
+    messages = deque(maxlen=lookback)
+    with open(filepath, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped (and hold no messages)
+            return []
+        with mm:
+            # Walk newlines backward from the end so only the last
+            # `lookback` non-blank lines are ever parsed
+            end = len(mm)
+            if mm[end - 1:end] == b'\n':
+                end -= 1
+            start = end
+            needed = lookback
+            while needed and start > 0:
+                nl = mm.rfind(b'\n', 0, start)
+                if mm[nl + 1:start].strip():
+                    needed -= 1
+                if nl == -1:
+                    start = 0
+                    break
+                start = nl
+            for line in mm[start:].split(b'\n'):
+                if line.strip():
+                    messages.append(json.loads(line))
+
+    return list(messages)
 
 
 def extract_bash_commands(messages: List[Dict]) -> List[Tuple[int, str]]:
@@ -104,22 +152,30 @@ def extract_text(content) -> str:
     return ''
 
 
+def precompute_texts(messages: List[Dict]) -> List[str]:
+    """Extract every message's text once so the checks share one list."""
+    return [extract_text(m.get('message', {}).get('content', '')) for m in messages]
+
+
+# str.startswith accepts a tuple and evaluates the whole disjunction in C
+_ACTION_TUPLE = tuple(sorted(ACTION_COMMANDS, key=len, reverse=True))
+_DIAGNOSTIC_TUPLE = tuple(sorted(DIAGNOSTIC_COMMANDS, key=len, reverse=True))
+
+
 def is_action_command(cmd: str) -> bool:
     """Check if command is an action (not diagnostic)."""
-    cmd_lower = cmd.lower().strip()
-    # Check if it starts with any action command
-    return any(cmd_lower.startswith(action) for action in ACTION_COMMANDS)
+    return cmd.lower().strip().startswith(_ACTION_TUPLE)
 
 
 def is_diagnostic_command(cmd: str) -> bool:
     """Check if command is diagnostic."""
-    cmd_lower = cmd.lower().strip()
-    # Check if it starts with any diagnostic command
-    return any(cmd_lower.startswith(diag) for diag in DIAGNOSTIC_COMMANDS)
+    return cmd.lower().strip().startswith(_DIAGNOSTIC_TUPLE)
 
 
-def check_retry_without_diagnosis(messages: List[Dict]) -> List[Dict]:
+def check_retry_without_diagnosis(messages: List[Dict], texts: List[str] = None) -> List[Dict]:
     """Detect retry-without-diagnosis pattern for ACTION commands only."""
+    if texts is None:
+        texts = precompute_texts(messages)
     warnings = []
     commands = extract_bash_commands(messages)
 
@@ -128,8 +184,9 @@ def check_retry_without_diagnosis(messages: List[Dict]) -> List[Dict]:
     for idx, cmd in commands:
         # Only track action commands
         if is_action_command(cmd):
-            # Normalize command (first few words) for comparison
-            cmd_normalized = ' '.join(cmd.split()[:3])
+            # Normalize command (first few words) for comparison; the
+            # bounded split stops tokenizing after the words we keep
+            cmd_normalized = ' '.join(cmd.split(None, 3)[:3])
             cmd_occurrences[cmd_normalized].append((idx, cmd))
 
     # Find retries of action commands
@@ -146,9 +203,8 @@ def check_retry_without_diagnosis(messages: List[Dict]) -> List[Dict]:
             diagnostic_found = False
             for msg_idx in range(first_idx + 1, second_idx):
                 if msg_idx < len(messages):
-                    msg_content = extract_text(messages[msg_idx].get('message', {}).get('content', ''))
                     # Check for diagnostic keywords
-                    if any(kw in msg_content.lower() for kw in ['kubectl logs', 'kubectl describe', 'kubectl get events', 'docker logs', 'journalctl', 'cat /var/log']):
+                    if _DIAGNOSTIC_KW_RE.search(texts[msg_idx].lower()):
                         diagnostic_found = True
                         break
 
@@ -164,54 +220,60 @@ def check_retry_without_diagnosis(messages: List[Dict]) -> List[Dict]:
     return warnings
 
 
-def check_credential_usage(messages: List[Dict]) -> List[Dict]:
+def check_credential_usage(messages: List[Dict], texts: List[str] = None) -> List[Dict]:
     """Detect credential usage in Bash commands without verification."""
+    if texts is None:
+        texts = precompute_texts(messages)
     warnings = []
-    commands = extract_bash_commands(messages)
 
-    kubectl_secret_indices = []
-    credential_usage = []
+    # Single streaming pass: remember the latest secret read and compare
+    # each credential use against it, instead of collecting both lists
+    # and running a linear scan per usage
+    last_secret_idx = None
 
-    # First pass: Find kubectl get secret commands
     for i, msg in enumerate(messages):
         if msg.get('type') != 'assistant':
             continue
-        content = extract_text(msg.get('message', {}).get('content', ''))
-        if 'kubectl get secret' in content.lower() or 'kubectl.*secret' in content.lower():
-            kubectl_secret_indices.append(i)
-
-    # Second pass: Find credential patterns in Bash commands
-    for idx, cmd in commands:
-        # Check if command contains credential assignment patterns
-        for pattern in CREDENTIAL_PATTERNS:
-            if re.search(pattern, cmd, re.IGNORECASE):
-                credential_usage.append((idx, cmd, pattern))
-                break
 
-    # For each credential usage, check if kubectl get secret was run nearby
-    for usage_idx, cmd, pattern in credential_usage:
-        # Check if kubectl get secret was run within 20 messages before
-        has_secret_read = any(abs(usage_idx - secret_idx) <= 20 and secret_idx <= usage_idx
-                             for secret_idx in kubectl_secret_indices)
+        content_lower = texts[i].lower()
+        if _KUBECTL_SECRET_RE.search(content_lower):
+            last_secret_idx = i
 
-        if not has_secret_read:
-            # Extract just the credential part for display
-            match = re.search(pattern, cmd, re.IGNORECASE)
-            cred_snippet = cmd[max(0, match.start()-10):min(len(cmd), match.end()+30)] if match else cmd[:50]
+        content = msg.get('message', {}).get('content', [])
+        if not isinstance(content, list):
+            continue
 
-            warnings.append({
-                'type': 'CREDENTIAL_ASSUMPTION',
-                'severity': 'HIGH',
-                'message_range': str(usage_idx),
-                'command': f"Found: {cred_snippet}...",
-                'suggestion': "Read from K8s secret: kubectl get secret <name> -o jsonpath='{.data.password}' | base64 -d"
-            })
+        for item in content:
+            if not (isinstance(item, dict) and item.get('name') == 'Bash'):
+                continue
+            cmd = item.get('input', {}).get('command', '')
+
+            # Check if command contains credential assignment patterns
+            for pattern in CREDENTIAL_PATTERNS_COMPILED:
+                match = pattern.search(cmd)
+                if match:
+                    # Warn unless kubectl get secret ran within 20
+                    # messages before this usage
+                    if last_secret_idx is None or i - last_secret_idx > 20:
+                        # Extract just the credential part for display
+                        cred_snippet = cmd[max(0, match.start()-10):min(len(cmd), match.end()+30)]
+
+                        warnings.append({
+                            'type': 'CREDENTIAL_ASSUMPTION',
+                            'severity': 'HIGH',
+                            'message_range': str(i),
+                            'command': f"Found: {cred_snippet}...",
+                            'suggestion': "Read from K8s secret: kubectl get secret <name> -o jsonpath='{.data.password}' | base64 -d"
+                        })
+                    break
 
     return warnings
 
 
-def check_preflight_missing(messages: List[Dict]) -> List[Dict]:
+def check_preflight_missing(messages: List[Dict], texts: List[str] = None) -> List[Dict]:
     """Detect missing preflight checks before integration/e2e tests."""
+    if texts is None:
+        texts = precompute_texts(messages)
     warnings = []
     commands = extract_bash_commands(messages)
 
@@ -221,8 +283,8 @@ def check_preflight_missing(messages: List[Dict]) -> List[Dict]:
     # Find E2E/integration test commands
     for idx, cmd in commands:
         # Check if command matches any E2E test pattern
-        for pattern in E2E_TEST_PATTERNS:
-            if re.search(pattern, cmd, re.IGNORECASE):
+        for pattern in E2E_TEST_PATTERNS_COMPILED:
+            if pattern.search(cmd):
                 test_indices.append((idx, cmd))
                 break
 
@@ -231,10 +293,8 @@ def check_preflight_missing(messages: List[Dict]) -> List[Dict]:
         if msg.get('type') != 'assistant':
             continue
 
-        content = extract_text(msg.get('message', {}).get('content', ''))
-
         # Check for preflight checks
-        if any(kw in content.lower() for kw in ['kubectl get pods', 'kubectl get svc', 'docker ps', 'curl', 'health', 'preflight']):
+        if _PREFLIGHT_KW_RE.search(texts[i].lower()):
             preflight_indices.append(i)
 
     # For each test run, check if preflight was done recently
@@ -262,21 +322,23 @@ def check_preflight_missing(messages: List[Dict]) -> List[Dict]:
     return warnings
 
 
-def check_tool_discovery(messages: List[Dict]) -> List[Dict]:
+def check_tool_discovery(messages: List[Dict], texts: List[str] = None) -> List[Dict]:
     """Detect if tools were never discovered."""
     warnings = []
 
     if len(messages) < 50:
         return warnings  # Too early to warn
+    if texts is None:
+        texts = precompute_texts(messages)
 
     # Check if ever ran tool discovery commands
     discovered = False
-    for msg in messages:
+    for i, msg in enumerate(messages):
         if msg.get('type') != 'assistant':
             continue
 
-        content = extract_text(msg.get('message', {}).get('content', ''))
-        if any(kw in content.lower() for kw in ['ls ~/.local/bin', 'ls ./scripts', 'cat tools.md']):
+        content_lower = texts[i].lower()
+        if any(kw in content_lower for kw in ['ls ~/.local/bin', 'ls ./scripts', 'cat tools.md']):
             discovered = True
             break
 
@@ -292,18 +354,21 @@ def check_tool_discovery(messages: List[Dict]) -> List[Dict]:
     return warnings
 
 
-def identify_good_practices(messages: List[Dict]) -> List[Dict]:
+def identify_good_practices(messages: List[Dict], texts: List[str] = None) -> List[Dict]:
     """Identify positive behaviors."""
+    if texts is None:
+        texts = precompute_texts(messages)
     good_practices = []
 
     for i, msg in enumerate(messages):
         if msg.get('type') != 'assistant':
             continue
 
-        content = extract_text(msg.get('message', {}).get('content', ''))
+        # Lowered once per message; every check below reads the same copy
+        content_lower = texts[i].lower()
 
         # Good: Reading from K8s secret
-        if 'kubectl get secret' in content.lower() and 'base64 -d' in content.lower():
+        if 'kubectl get secret' in content_lower and 'base64 -d' in content_lower:
             good_practices.append({
                 'type': 'CREDENTIAL_FROM_SECRET',
                 'message_idx': i,
@@ -312,7 +377,7 @@ def identify_good_practices(messages: List[Dict]) -> List[Dict]:
             })
 
         # Good: Diagnostic before retry
-        if any(kw in content.lower() for kw in ['kubectl logs', 'kubectl describe', 'kubectl get events']):
+        if _GOOD_DIAGNOSTIC_KW_RE.search(content_lower):
             good_practices.append({
                 'type': 'DIAGNOSTIC_BEFORE_RETRY',
                 'message_idx': i,
@@ -321,7 +386,7 @@ def identify_good_practices(messages: List[Dict]) -> List[Dict]:
             })
 
         # Good: Asking about scope
-        if any(kw in content.lower() for kw in ['should i', 'do you want me to', 'this will', 'this expands']):
+        if _SCOPE_ASK_KW_RE.search(content_lower):
             good_practices.append({
                 'type': 'SCOPE_CONFIRMATION',
                 'message_idx': i,
@@ -341,9 +406,13 @@ def generate_report(warnings: List[Dict], good_practices: List[Dict], rules: Dic
 
     # Warnings - grouped by severity
     if warnings:
-        # Sort by severity (HIGH first)
-        severity_order = {'HIGH': 0, 'MEDIUM': 1, 'LOW': 2}
-        sorted_warnings = sorted(warnings, key=lambda w: severity_order.get(w['severity'], 3))
+        # Bucket by severity (HIGH first): one append per warning and a
+        # concatenation, stable within each level like sorted() was
+        buckets = {'HIGH': [], 'MEDIUM': [], 'LOW': []}
+        other = []
+        for w in warnings:
+            buckets.get(w['severity'], other).append(w)
+        sorted_warnings = buckets['HIGH'] + buckets['MEDIUM'] + buckets['LOW'] + other
 
         lines.append(f"⚠️  WARNINGS ({len(warnings)} found):")
         lines.append("")
@@ -374,7 +443,7 @@ def generate_report(warnings: List[Dict], good_practices: List[Dict], rules: Dic
         lines.append("")
 
         for i, gp in enumerate(unique_practices.values(), 1):
-            rule = next((r for r in rules['universal_rules'] if r['id'] == gp['rule']), None)
+            rule = rules['by_id'].get(gp['rule'])
             lines.append(f"{i}. {gp['type'].replace('_', ' ').title()} (Message {gp['message_idx']})")
             lines.append(f"   - {gp['description']}")
             if rule:
@@ -403,12 +472,12 @@ def main(conversation_file: str):
     """Main entry point with differential lookback strategy."""
     print("Loading conversation...")
 
-    # Load full conversation for critical checks
-    all_messages = []
-    with open(conversation_file, 'r') as f:
-        for line in f:
-            if line.strip():
-                all_messages.append(json.loads(line))
+    # Load full conversation for critical checks (credential and
+    # tool-discovery scans need the whole history); one bulk read plus
+    # split avoids per-line readline overhead
+    with open(conversation_file, 'rb') as f:
+        data = f.read()
+    all_messages = [json.loads(line) for line in data.splitlines() if line]
 
     print(f"Loaded {len(all_messages)} total messages")
 
@@ -418,20 +487,24 @@ def main(conversation_file: str):
 
     rules = load_rules()
 
+    # Extract each message's text once; every check shares these lists
+    all_texts = precompute_texts(all_messages)
+    recent_texts = all_texts[-50:] if len(all_texts) > 50 else all_texts
+
     # Run detectors with appropriate lookback
     warnings = []
 
     # Recent pattern checks (50 messages)
-    warnings.extend(check_retry_without_diagnosis(recent_messages))
-    warnings.extend(check_preflight_missing(recent_messages))
+    warnings.extend(check_retry_without_diagnosis(recent_messages, recent_texts))
+    warnings.extend(check_preflight_missing(recent_messages, recent_texts))
 
     # Critical pattern checks (full conversation)
     print("Scanning full conversation for critical patterns (credentials, tools)...")
-    warnings.extend(check_credential_usage(all_messages))
-    warnings.extend(check_tool_discovery(all_messages))
+    warnings.extend(check_credential_usage(all_messages, all_texts))
+    warnings.extend(check_tool_discovery(all_messages, all_texts))
 
     # Identify good practices (recent messages)
-    good_practices = identify_good_practices(recent_messages)
+    good_practices = identify_good_practices(recent_messages, recent_texts)
 
     # Generate report
     report = generate_report(warnings, good_practices, rules)
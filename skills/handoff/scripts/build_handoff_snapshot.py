@@ -16,15 +16,39 @@ def _run(cmd: list[str], cwd: Path) -> str:
     return result.stdout.strip()
 
 
-def _find_candidates(root: Path, name: str) -> list[str]:
-    matches: list[str] = []
-    for base, dirs, files in os.walk(root):
-        if ".git" in dirs:
-            dirs.remove(".git")
-        if name in files:
-            rel = Path(base, name).relative_to(root)
-            matches.append(str(rel))
-    return sorted(matches)
+_SKIP_DIRS = {
+    ".git",
+    "node_modules",
+    ".venv",
+    "venv",
+    "__pycache__",
+    ".mypy_cache",
+    ".pytest_cache",
+    "build",
+    "dist",
+    ".tox",
+    ".idea",
+    ".vscode",
+}
+
+
+def _find_candidates_multi(root: Path, names: list[str]) -> dict[str, list[str]]:
+    matches: dict[str, list[str]] = {name: [] for name in names}
+    wanted = set(names)
+    stack = [str(root)]
+    while stack:
+        base = stack.pop()
+        try:
+            with os.scandir(base) as entries:
+                for entry in entries:
+                    if entry.name in wanted and entry.is_file(follow_symlinks=False):
+                        rel = Path(entry.path).relative_to(root)
+                        matches[entry.name].append(str(rel))
+                    elif entry.is_dir(follow_symlinks=False) and entry.name not in _SKIP_DIRS:
+                        stack.append(entry.path)
+        except OSError:
+            continue
+    return {name: sorted(found) for name, found in matches.items()}
 
 
 def main() -> int:
@@ -34,17 +58,22 @@ def main() -> int:
     args = parser.parse_args()
 
     repo_hint = Path(args.repo).resolve()
-    repo_root = Path(_run(["git", "rev-parse", "--show-toplevel"], repo_hint))
-    branch = _run(["git", "rev-parse", "--abbrev-ref", "HEAD"], repo_root)
-    head = _run(["git", "rev-parse", "HEAD"], repo_root)
+    # rev-parse emits one line per argument, so toplevel, HEAD sha, and
+    # branch name come back from a single git invocation.
+    toplevel, head, branch = _run(
+        ["git", "rev-parse", "--show-toplevel", "HEAD", "--abbrev-ref", "HEAD"],
+        repo_hint,
+    ).splitlines()
+    repo_root = Path(toplevel)
     status = _run(["git", "status", "--short"], repo_root)
     commits = _run(["git", "log", f"-n{args.max_commits}", "--oneline"], repo_root)
 
     root_plan = repo_root / "IMPLEMENTATION_PLAN.md"
     root_prompt = repo_root / "PROMPT.md"
 
-    plan_candidates = _find_candidates(repo_root, "IMPLEMENTATION_PLAN.md")
-    prompt_candidates = _find_candidates(repo_root, "PROMPT.md")
+    candidates = _find_candidates_multi(repo_root, ["IMPLEMENTATION_PLAN.md", "PROMPT.md"])
+    plan_candidates = candidates["IMPLEMENTATION_PLAN.md"]
+    prompt_candidates = candidates["PROMPT.md"]
 
     print("# Handoff Snapshot")
     print()
@@ -10,8 +10,10 @@ Examples:
 from __future__ import annotations
 
 import argparse
-import json
+import functools
+import os
 import re
+import tomllib
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -29,10 +31,19 @@ SECTION_PRIORITY_RE = re.compile(
 BULLET_RE = re.compile(r"^\s*[-*]\s*(?:\[[ xX]?\]\s*)?(.*)$")
 NUMBERED_RE = re.compile(r"^\s*\d+[\.|)]\s+(.*)$")
 
-TRANCHE_KEY_RE = re.compile(r"^\s*key\s*=\s*\"(I\d+)\"\s*$")
-TRANCHE_GROUP_RE = re.compile(r"^\s*group\s*=\s*\"([^\"]+)\"\s*$")
-TRANCHE_STATUS_RE = re.compile(r"^\s*status\s*=\s*\"([^\"]+)\"\s*$")
-TRANCHE_SUMMARY_RE = re.compile(r"^\s*summary\s*=\s*\"(.*)\"\s*$")
+# Fused header/bullet/numbered matcher for parse_vision_items. The
+# branches are mutually exclusive on their first character, which also
+# serves as a cheap gate for prose lines.
+VISION_LINE_RE = re.compile(
+    r"^(?:#{1,6}\s+(?P<header>.*)"
+    r"|[-*]\s*(?:\[[ xX]?\]\s*)?(?P<bullet>.*)"
+    r"|\d+[\.|)]\s+(?P<numbered>.*))$"
+)
+_VISION_GATE_CHARS = frozenset("#-*0123456789")
+
+PRINCIPAL_RE = re.compile(r"principal[-_ ]?architect", re.IGNORECASE)
+
+SKIP_WALK_DIRS = {".git", "node_modules", "__pycache__", ".venv", "venv"}
 
 
 def parse_args() -> argparse.Namespace:
@@ -50,8 +61,13 @@ def parse_args() -> argparse.Namespace:
     return p.parse_args()
 
 
+_NORM_RE = re.compile(r"[^a-zA-Z0-9]+")
+
+
 def normalize_text(value: str) -> str:
-    return re.sub(r"\s+", " ", re.sub(r"[^a-zA-Z0-9 ]", " ", value)).strip().lower()
+    # One pass: runs of non-alphanumerics (whitespace included) collapse
+    # to a single space, matching the old two-sub pipeline.
+    return _NORM_RE.sub(" ", value).strip().lower()
 
 
 def resolve_path(project_root: Path, value: str) -> Path:
@@ -67,33 +83,58 @@ def find_file(base: Path, names: List[str]) -> Optional[Path]:
     return None
 
 
+_plan_lines_cache: Dict[str, Tuple[Tuple[int, int], List[str]]] = {}
+
+
+def read_plan_lines(path: Path) -> List[str]:
+    """Read the plan file once per on-disk version.
+
+    Keyed by (mtime_ns, size) so a --apply rewrite invalidates the cache
+    while the parse/insert passes within one run share a single read.
+    """
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _plan_lines_cache.get(str(path))
+    if cached and cached[0] == stamp:
+        return cached[1]
+    lines = path.read_text(encoding="utf-8").splitlines()
+    _plan_lines_cache[str(path)] = (stamp, lines)
+    return lines
+
+
+def _line_byte_offset(raw: bytes, line_index: int) -> int:
+    """Byte offset where line `line_index` starts in LF-terminated data."""
+    offset = 0
+    find = raw.find
+    for _ in range(line_index):
+        nl = find(b"\n", offset)
+        if nl == -1:
+            return len(raw)
+        offset = nl + 1
+    return offset
+
+
 def parse_implementation_plan(path: Path) -> List[Dict[str, str]]:
     entries: List[Dict[str, str]] = []
-    text = path.read_text(encoding="utf-8")
-    lines = text.splitlines()
+    lines = read_plan_lines(path)
 
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        match = PLAN_HEADER_RE.match(line)
+    header_match = PLAN_HEADER_RE.match
+    for line in lines:
+        match = header_match(line)
         if not match:
-            i += 1
             continue
-
-        entry: Dict[str, str] = {
-            "ordinal": match.group(1),
-            "key": match.group(2),
-            "title": match.group(3).strip(),
-            "status": match.group(4),
-            "group": match.group(5),
-        }
-
-        j = i + 1
-        while j < len(lines) and not PLAN_HEADER_RE.match(lines[j]):
-            j += 1
-
-        entries.append(entry)
-        i = j
+        ordinal, key, title, status, group = match.groups()
+        title = title.strip()
+        entries.append(
+            {
+                "ordinal": ordinal,
+                "key": key,
+                "title": title,
+                "status": status,
+                "group": group,
+                "_norm_title": normalize_text(title),
+            }
+        )
 
     return entries
 
@@ -101,7 +142,10 @@ def parse_implementation_plan(path: Path) -> List[Dict[str, str]]:
 def split_plan_text_for_insertion(lines: List[str]) -> Tuple[int, int]:
     start = None
     for i, line in enumerate(lines):
-        if line.strip() == "## Next Work Tranches":
+        # Substring gate first: C-level scan, no allocation. strip()
+        # (which allocates) only runs on candidate lines, and still
+        # tolerates surrounding whitespace like before.
+        if "## Next Work Tranches" in line and line.strip() == "## Next Work Tranches":
             start = i
             break
     if start is None:
@@ -116,80 +160,117 @@ def split_plan_text_for_insertion(lines: List[str]) -> Tuple[int, int]:
 
 
 def parse_vision_items(path: Path) -> List[str]:
-    lines = path.read_text(encoding="utf-8").splitlines()
     in_scope = False
     items: List[str] = []
 
-    for line in lines:
-        header = VISION_SECTION_RE.match(line)
-        if header:
-            in_scope = bool(SECTION_PRIORITY_RE.search(header.group(1)))
-            continue
-
-        if not in_scope:
-            continue
-
-        bullet = BULLET_RE.match(line)
-        if bullet:
-            text = bullet.group(1).strip()
+    # Lines keep their trailing newline here; every captured group is
+    # stripped before use, so matching is unaffected.
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            stripped = line.lstrip()
+            if stripped[:1] not in _VISION_GATE_CHARS:
+                continue
+
+            match = VISION_LINE_RE.match(stripped)
+            if not match:
+                continue
+
+            header = match.group("header")
+            if header is not None:
+                in_scope = bool(SECTION_PRIORITY_RE.search(header))
+                continue
+
+            if not in_scope:
+                continue
+
+            text = match.group("bullet")
+            if text is None:
+                text = match.group("numbered")
+            text = text.strip()
             if text:
                 items.append(text)
-            continue
 
-        numbered = NUMBERED_RE.match(line)
-        if numbered and in_scope:
-            text = numbered.group(1).strip()
-            if text:
-                items.append(text)
-
-    # Keep unique while preserving order.
-    deduped: List[str] = []
-    seen = set()
+    # Keep unique while preserving order; setdefault keeps the first
+    # spelling of each normalized key (a plain comprehension would keep
+    # the last).
+    deduped: Dict[str, str] = {}
     for text in items:
         key = normalize_text(text)
-        if key and key not in seen:
-            deduped.append(text)
-            seen.add(key)
-
-    return deduped
-
-
-def max_key(entries: List[Dict[str, str]]) -> int:
-    values = [int(e["key"][1:]) for e in entries if e["key"].startswith("I")]
-    return max(values) if values else 0
-
+        if key:
+            deduped.setdefault(key, text)
+
+    return list(deduped.values())
+
+
+def max_ordinal_and_key(entries: List[Dict[str, str]]) -> Tuple[int, int]:
+    """Highest ordinal and I-key over the entries in one pass."""
+    max_ordinal = 0
+    max_key = 0
+    for e in entries:
+        ordinal = e.get("ordinal", "0")
+        if ordinal.isdigit():
+            max_ordinal = max(max_ordinal, int(ordinal))
+        key = e["key"]
+        if key.startswith("I"):
+            max_key = max(max_key, int(key[1:]))
+    return max_ordinal, max_key
+
+
+GROUP_KEYWORD_RE = re.compile(
+    r"\b(?:"
+    r"(?P<io>read|write|edit|patch|file|filesystem|glob|index)"
+    r"|(?P<shell>shell|command|bash|run|process|exec)"
+    r"|(?P<model>router|model|provider|anthropic|openai|kimi)"
+    r"|(?P<perm>sandbox|security|permission|policy|safe|deny|allow)"
+    r"|(?P<search>lsp|symbol|search|repo|ast|reflector)"
+    r")\b"
+)
 
-def max_ordinal(entries: List[Dict[str, str]]) -> int:
-    ordinals = [int(e["ordinal"]) for e in entries if e.get("ordinal", "0").isdigit()]
-    return max(ordinals) if ordinals else 0
+GROUP_BY_NAME = {
+    "io": ("tool-io", 0),
+    "shell": ("tool-shell", 1),
+    "model": ("multi-model", 2),
+    "perm": ("permission-mode", 3),
+    "search": ("tool-search-ui", 4),
+}
 
 
 def guess_group(text: str) -> str:
-    t = text.lower()
-    if re.search(r"\b(read|write|edit|patch|file|filesystem|glob|index)\b", t):
-        return "tool-io"
-    if re.search(r"\b(shell|command|bash|run|process|exec)\b", t):
-        return "tool-shell"
-    if re.search(r"\b(router|model|provider|anthropic|openai|kimi)\b", t):
-        return "multi-model"
-    if re.search(r"\b(sandbox|security|permission|policy|safe|deny|allow)\b", t):
-        return "permission-mode"
-    if re.search(r"\b(lsp|symbol|search|repo|ast|reflector)\b", t):
-        return "tool-search-ui"
-    return "cross-cutting"
+    # One scan over the text; pick the highest-priority category hit so
+    # behaviour matches the old sequential per-category searches.
+    best = None
+    best_rank = len(GROUP_BY_NAME)
+    for match in GROUP_KEYWORD_RE.finditer(text.lower()):
+        group, rank = GROUP_BY_NAME[match.lastgroup]
+        if rank < best_rank:
+            best, best_rank = group, rank
+            if rank == 0:
+                break
+    return best or "cross-cutting"
+
+
+@functools.lru_cache(maxsize=None)
+def _exists(path_str: str) -> bool:
+    try:
+        os.lstat(path_str)
+    except OSError:
+        return False
+    return True
 
 
 def find_principal_architect(paths: List[Path]) -> List[Path]:
     candidates: List[Path] = []
     for base in paths:
-        if not base.exists():
+        if not _exists(str(base)):
             continue
-        for item in base.glob("**/*.md"):
-            if item.is_file() and (
-                re.search(r"principal[-_ ]?architect", item.name, re.IGNORECASE)
-                or ("architect" in item.stem.lower() and "principal" in item.stem.lower())
-            ):
-                candidates.append(item)
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_WALK_DIRS]
+            for name in filenames:
+                if not name.endswith(".md"):
+                    continue
+                stem = name[:-3].lower()
+                if PRINCIPAL_RE.search(name) or ("architect" in stem and "principal" in stem):
+                    candidates.append(Path(dirpath) / name)
 
     uniq = []
     seen = set()
@@ -207,14 +288,16 @@ def sync_plan(
     existing_plan_entries: List[Dict[str, str]],
     source_name: str,
     apply_changes: bool,
-) -> Tuple[int, List[str]]:
-    existing_titles = {normalize_text(e["title"]) for e in existing_plan_entries}
-    next_ordinal = max_ordinal(existing_plan_entries) + 1
-    next_key = max_key(existing_plan_entries) + 1
+) -> Tuple[int, List[Dict[str, str]]]:
+    existing_titles = {e["_norm_title"] for e in existing_plan_entries}
+    next_ordinal, next_key = max_ordinal_and_key(existing_plan_entries)
+    next_ordinal += 1
+    next_key += 1
 
     proposals: List[Dict[str, str]] = []
     for item in vision_items:
-        if normalize_text(item) in existing_titles:
+        norm = normalize_text(item)
+        if norm in existing_titles:
             continue
 
         proposals.append(
@@ -225,6 +308,7 @@ def sync_plan(
                 "status": "incomplete",
                 "group": guess_group(item),
                 "source": source_name,
+                "_norm_title": norm,
             }
         )
         next_ordinal += 1
@@ -233,70 +317,73 @@ def sync_plan(
     if not proposals:
         return 0, []
 
-    lines = plan_path.read_text(encoding="utf-8").splitlines()
+    lines = read_plan_lines(plan_path)
     _, end = split_plan_text_for_insertion(lines)
 
+    # One string per proposal; "\n".join at write time restores the
+    # exact line structure the old per-line extend produced.
     insert: List[str] = []
     for proposal in proposals:
-        insert.extend(
-            [
-                f"{proposal['ordinal']}. {proposal['key']} `{proposal['title']}`: {proposal['status']}. tranche_group={proposal['group']}",
-                "    Scope:",
-                f"1. From {proposal['source']}: {proposal['title']}",
-                "    Exit criteria:",
-                "1. Implement this tranche and add verification evidence when complete.",
-                "",
-            ]
+        insert.append(
+            f"{proposal['ordinal']}. {proposal['key']} `{proposal['title']}`: {proposal['status']}. tranche_group={proposal['group']}\n"
+            "    Scope:\n"
+            f"1. From {proposal['source']}: {proposal['title']}\n"
+            "    Exit criteria:\n"
+            "1. Implement this tranche and add verification evidence when complete.\n"
         )
 
-    if lines and lines[-1].strip() != "":
-        lines.append("")
-    lines[end:end] = insert
-
     if apply_changes:
-        plan_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
-
-    return len(proposals), [p["title"] for p in proposals]
+        # Stream the rewrite at a byte offset instead of rebuilding the
+        # whole file from a line list: copy bytes up to the insertion
+        # point, emit the new blocks, copy the remainder. Assumes
+        # LF-terminated lines, which write_text produced anyway.
+        raw = plan_path.read_bytes()
+        offset = _line_byte_offset(raw, end)
+        head = raw[:offset]
+        tail = raw[offset:]
+        if tail:
+            if not tail.endswith(b"\n"):
+                tail += b"\n"
+        elif head and not head.endswith(b"\n"):
+            head += b"\n"
+        if lines[-1].strip() != "":
+            # Matches the old trailing blank line appended when the
+            # file's last line held content.
+            tail += b"\n"
+        with plan_path.open("wb") as handle:
+            handle.write(head)
+            for block in insert:
+                handle.write(block.encode("utf-8"))
+                handle.write(b"\n")
+            handle.write(tail)
+
+    return len(proposals), proposals
 
 
 def parse_toml_tranches(path: Path) -> List[Dict[str, str]]:
     if not path.exists():
         return []
 
-    entries: List[Dict[str, str]] = []
-    current: Dict[str, str] = {}
-
-    for raw in path.read_text(encoding="utf-8").splitlines():
-        if raw.strip().startswith("[[tranches]]"):
-            if current:
-                entries.append(current)
-            current = {}
-            continue
-
-        key_match = TRANCHE_KEY_RE.match(raw)
-        if key_match:
-            current["key"] = key_match.group(1)
-            continue
-
-        group_match = TRANCHE_GROUP_RE.match(raw)
-        if group_match:
-            current["group"] = group_match.group(1)
-            continue
+    data = tomllib.loads(path.read_text(encoding="utf-8"))
+    return [
+        {
+            "key": t.get("key", ""),
+            "group": t.get("group", ""),
+            "status": t.get("status", ""),
+            "summary": t.get("summary", ""),
+        }
+        for t in data.get("tranches", [])
+    ]
 
-        status_match = TRANCHE_STATUS_RE.match(raw)
-        if status_match:
-            current["status"] = status_match.group(1)
-            continue
 
-        summary_match = TRANCHE_SUMMARY_RE.match(raw)
-        if summary_match:
-            current["summary"] = summary_match.group(1)
-            continue
+_TOML_ESCAPES = {8: "\\b", 9: "\\t", 10: "\\n", 12: "\\f", 13: "\\r", 34: '\\"', 92: "\\\\"}
+_TOML_ESCAPES.update({c: f"\\u{c:04x}" for c in range(0x20) if c not in _TOML_ESCAPES})
+_TOML_TABLE = str.maketrans(_TOML_ESCAPES)
 
-    if current:
-        entries.append(current)
 
-    return entries
+def toml_quote(value: str) -> str:
+    """Quote a value as a TOML basic string in one translate pass."""
+    return f'"{value.translate(_TOML_TABLE)}"'
 
 
 def sync_tranches(
@@ -315,15 +402,12 @@ def sync_tranches(
 
     blocks: List[str] = []
     for e in to_add:
-        blocks.extend(
-            [
-                "",
-                "[[tranches]]",
-                f'key = "{e["key"]}"',
-                f'summary = {json.dumps(e["title"])}',
-                f'status = "{e["status"]}"',
-                f'group = "{e["group"]}"',
-            ]
+        blocks.append(
+            "\n[[tranches]]\n"
+            f'key = "{e["key"]}"\n'
+            f"summary = {toml_quote(e['title'])}\n"
+            f'status = "{e["status"]}"\n'
+            f'group = "{e["group"]}"'
         )
 
     if apply_changes:
@@ -376,7 +460,7 @@ def run() -> int:
     if not args.only_tranches:
         if vision_path:
             vision_items = parse_vision_items(vision_path)
-            plan_added, plan_titles = sync_plan(
+            plan_added, new_entries = sync_plan(
                 plan_path,
                 vision_items,
                 plan_entries,
@@ -386,9 +470,12 @@ def run() -> int:
             print(f"vision_file={vision_path}")
             print(f"plan_sync_count={plan_added}")
             if plan_added:
-                print("plan_sync_added=\n" + "\n".join(f"- {t}" for t in plan_titles))
+                print("plan_sync_added=\n" + "\n".join(f"- {e['title']}" for e in new_entries))
                 if args.apply:
-                    plan_entries = parse_implementation_plan(plan_path)
+                    # sync_plan already built the appended entries in
+                    # parse_implementation_plan's schema; patch the list
+                    # instead of re-reading the file.
+                    plan_entries = plan_entries + new_entries
             else:
                 print("plan_sync_added=none")
         else: